@@ -4,11 +4,12 @@ Classification module for AI Job Scanner.
 Handles heuristic classification of job messages for AI/automation relevance.
 """
 
-from .rules import classify, ClassificationResult, KEYWORD_GROUPS, get_keyword_groups, add_keyword
+from .rules import classify, classify_many, ClassificationResult, KEYWORD_GROUPS, get_keyword_groups, add_keyword
 from .run import MessageClassifier
 
 __all__ = [
     "classify",
+    "classify_many",
     "ClassificationResult",
     "KEYWORD_GROUPS",
     "get_keyword_groups",
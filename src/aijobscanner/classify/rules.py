@@ -333,6 +333,36 @@ KEYWORD_GROUPS = {
 }
 
 
+# Compiled keyword patterns, built lazily from KEYWORD_GROUPS and reset by add_keyword()
+_COMPILED_GROUPS = None
+
+
+def _get_compiled_groups() -> List[Tuple[str, float, List[Tuple[str, re.Pattern]]]]:
+    """
+    Compile word-boundary patterns for every keyword once.
+
+    Returns:
+        List of (group_name, weight, [(keyword, pattern), ...]) tuples
+    """
+    global _COMPILED_GROUPS
+
+    if _COMPILED_GROUPS is None:
+        _COMPILED_GROUPS = [
+            (
+                group_name,
+                group_data["weight"],
+                [
+                    # Word boundary regex to avoid substring matches
+                    (k.lower(), re.compile(r'\b' + re.escape(k.lower()) + r'\b', re.IGNORECASE))
+                    for k in group_data["keywords_en"]
+                ],
+            )
+            for group_name, group_data in KEYWORD_GROUPS.items()
+        ]
+
+    return _COMPILED_GROUPS
+
+
 def classify(text: str) -> ClassificationResult:
     """
     Classify a message text for AI/automation relevance.
@@ -365,19 +395,12 @@ def classify(text: str) -> ClassificationResult:
     score_breakdown = {}
 
     # Check each keyword group
-    for group_name, group_data in KEYWORD_GROUPS.items():
-        group_weight = group_data["weight"]
-        group_keywords = [k.lower() for k in group_data["keywords_en"]]
-
+    for group_name, group_weight, group_patterns in _get_compiled_groups():
         group_matches = []
         group_score = 0.0
 
-        # Check keywords using word boundary matching
-        for keyword in group_keywords:
-            # Use word boundary regex to avoid substring matches
-            # Escape special regex characters in keyword
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, text_lower, re.IGNORECASE):
+        for keyword, pattern in group_patterns:
+            if pattern.search(text_lower):
                 group_matches.append(keyword)
                 group_score += group_weight
 
@@ -472,6 +495,19 @@ def classify(text: str) -> ClassificationResult:
     )
 
 
+def classify_many(texts: List[str]) -> List[ClassificationResult]:
+    """
+    Classify a batch of message texts.
+
+    Args:
+        texts: Message texts to classify
+
+    Returns:
+        List of ClassificationResult, in the same order as texts
+    """
+    return [classify(text) for text in texts]
+
+
 def get_keyword_groups() -> Dict[str, Dict[str, Any]]:
     """
     Get all keyword groups for reference/tuning.
@@ -496,5 +532,8 @@ def add_keyword(group_name: str, keyword: str) -> bool:
     if group_name not in KEYWORD_GROUPS:
         return False
 
+    global _COMPILED_GROUPS
+
     KEYWORD_GROUPS[group_name]["keywords_en"].append(keyword)
+    _COMPILED_GROUPS = None
     return True
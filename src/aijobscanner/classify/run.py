@@ -16,13 +16,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
 from storage import (
     init_db,
-    fetch_pending_messages,
-    upsert_message_classification,
-    mark_message_classified,
+    close_db,
+    iter_pending_batches,
+    save_classifications_batch,
     get_classification_statistics,
     fetch_ai_relevant_messages,
 )
-from .rules import classify, ClassificationResult
+from .rules import classify, classify_many, ClassificationResult
 
 
 CLASSIFIER_VERSION = "1.0.0"
@@ -36,17 +36,20 @@ class MessageClassifier:
     - Batch classification of pending messages
     - Idempotent processing (skip already-classified unless --reprocess)
     - CSV export with formula injection mitigation
-    - Audit trail in message_classifications table
+    - Audit trail in message_classifications table (or a JSONL audit log)
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, audit_log: Optional[str] = None):
         """
         Initialize classifier.
 
         Args:
             db_path: Path to SQLite database
+            audit_log: Optional JSONL file to append the audit trail to
+                instead of the message_classifications table
         """
         self.db_path = db_path
+        self.audit_log = audit_log
         self.conn = None
         self.results = {
             "processed": 0,
@@ -58,11 +61,13 @@ class MessageClassifier:
     def connect(self):
         """Initialize database connection."""
         self.conn = init_db(self.db_path)
+        if self.audit_log:
+            Path(self.audit_log).parent.mkdir(parents=True, exist_ok=True)
 
     def disconnect(self):
         """Close database connection."""
         if self.conn:
-            self.conn.close()
+            close_db(self.conn)
 
     def classify_batch(
         self,
@@ -70,15 +75,19 @@ class MessageClassifier:
         only_source_id: Optional[str] = None,
         reprocess: bool = False,
         dry_run: bool = False,
+        batch_size: int = 32,
     ) -> Dict[str, Any]:
         """
         Classify a batch of messages.
 
+        Messages are classified and written in chunks of batch_size.
+
         Args:
             limit: Maximum messages to process
             only_source_id: Filter to specific source
             reprocess: Reprocess already-classified messages
             dry_run: Don't write to database
+            batch_size: Number of messages per classification chunk
 
         Returns:
             Dict with processing results
@@ -91,56 +100,87 @@ class MessageClassifier:
             "errors": 0,
         }
 
-        # Fetch messages
-        messages = fetch_pending_messages(
+        # Stream messages from the database one batch at a time
+        print(f"\n[INFO] Processing pending messages in batches of {batch_size}")
+
+        for chunk in iter_pending_batches(
             self.conn,
             limit=limit,
             only_source_id=only_source_id,
             reprocess=reprocess,
-        )
+            batch_size=batch_size,
+        ):
+            self._classify_chunk(chunk, dry_run)
 
-        print(f"\n[INFO] Processing {len(messages)} message(s)")
+        return self.results
 
-        for msg in messages:
-            try:
-                # Classify
-                result: ClassificationResult = classify(msg["text"])
-
-                if not dry_run:
-                    # Write to message_classifications (audit trail)
-                    upsert_message_classification(
-                        self.conn,
-                        source_id=msg["source_id"],
-                        tg_message_id=msg["tg_message_id"],
-                        tg_chat_id=msg["tg_chat_id"],
-                        classifier_version=CLASSIFIER_VERSION,
-                        is_ai_relevant=result.is_ai_relevant,
-                        score=result.score,
-                        reasons=result.reasons,
-                        classification_metadata=result.metadata,
-                    )
-
-                    # Update telegram_messages
-                    mark_message_classified(
-                        self.conn,
-                        source_id=msg["source_id"],
-                        tg_message_id=msg["tg_message_id"],
-                        is_ai_relevant=result.is_ai_relevant,
-                        score=result.score,
-                    )
-
-                # Update counters
-                self.results["processed"] += 1
-                if result.is_ai_relevant == 1:
-                    self.results["ai_relevant"] += 1
-                else:
-                    self.results["not_relevant"] += 1
+    def _classify_chunk(
+        self,
+        messages: List[Dict[str, Any]],
+        dry_run: bool,
+    ) -> None:
+        """
+        Classify one chunk of messages and store the results.
 
-            except Exception as e:
-                print(f"   [WARN] Error processing message {msg['tg_message_id']}: {e}")
-                self.results["errors"] += 1
+        If classifying the chunk as a whole fails, its messages are retried
+        one at a time so a single bad message only costs one error.
 
-        return self.results
+        Args:
+            messages: Message dicts from iter_pending_batches
+            dry_run: Don't write to database
+        """
+        try:
+            results: List[ClassificationResult] = classify_many(
+                [msg["text"] for msg in messages]
+            )
+        except Exception:
+            kept, results = [], []
+            for msg in messages:
+                try:
+                    results.append(classify(msg["text"]))
+                except Exception as e:
+                    print(f"   [WARN] Error processing message {msg['tg_message_id']}: {e}")
+                    self.results["errors"] += 1
+                    continue
+                kept.append(msg)
+            messages = kept
+
+        if not messages:
+            return
+
+        if not dry_run:
+            try:
+                # Audit trail + telegram_messages update in one transaction
+                # (the JSONL audit log, if any, is appended just before commit)
+                save_classifications_batch(
+                    self.conn,
+                    CLASSIFIER_VERSION,
+                    [
+                        (
+                            msg["source_id"],
+                            msg["tg_message_id"],
+                            msg["tg_chat_id"],
+                            result.is_ai_relevant,
+                            result.score,
+                            result.reasons,
+                            result.metadata,
+                        )
+                        for msg, result in zip(messages, results)
+                    ],
+                    audit_log=self.audit_log,
+                )
+            except Exception as e:
+                print(f"   [WARN] Error storing batch of {len(messages)} message(s): {e}")
+                self.results["errors"] += len(messages)
+                return
+
+        # Update counters
+        for result in results:
+            self.results["processed"] += 1
+            if result.is_ai_relevant == 1:
+                self.results["ai_relevant"] += 1
+            else:
+                self.results["not_relevant"] += 1
 
     def export_candidates_to_csv(
         self,
@@ -7,79 +7,269 @@ Provides command-line interface for source validation.
 import sys
 import os
 import argparse
-import asyncio
+import functools
+import hashlib
+import json
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, is_dataclass
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Optional
 
-# Load environment variables from .env file
-load_dotenv()
-
-# Add src to path for imports
+# Add src and the repo root (for the storage package) to path for imports.
+# Command modules are imported inside each command so that --help and
+# argparse errors don't pay for Telethon and friends.
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from aijobscanner.telegram import (
-    load_sources,
-    save_sources,
-    get_enabled_sources,
-    update_source_validation,
-    SourceValidator,
-    MessageIngestor,
-)
 
-from aijobscanner.classify import MessageClassifier
+class ConfigError(Exception):
+    """Raised when required environment configuration is missing or invalid."""
+    pass
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from storage import get_classification_statistics, init_db
-from aijobscanner.classify.run import update_project_track_with_classification
+@dataclass(frozen=True, slots=True)
+class TelegramEnv:
+    """Telegram credentials and session settings read from the environment."""
+    api_id: int
+    api_hash: str
+    phone: str
+    two_fa_password: Optional[str]
+    session_dir: str
+    concurrency: int
+
+
+@dataclass(frozen=True, slots=True)
+class CliDefaults:
+    """Default values for command-line options, shared across subcommands."""
+    sources_path: str = "config/telegram_sources.yaml"
+    db_path: str = "data/db/aijobscanner.sqlite3"
+    report_dir: str = "data/reports"
+    project_track_path: str = "project_track.md"
+    validate_limit: int = 1
+    limit_per_source: int = 200
+    classify_limit: int = 500
+    batch_size: int = 32
+    export_dir: str = "data/review"
+    export_limit: int = 100
+    applicants_path: str = "config/applicants.yaml"
+    outbox_dir: str = "data/outbox"
+    apply_limit: int = 50
+    max_per_run: int = 10
+
 
-# Auto-apply imports
-from aijobscanner.apply.send import process_pending_sends, SecurityError
-from aijobscanner.apply.outbox import OutboxManager
+DEFAULTS = CliDefaults()
 
 
-def print_summary(results: list) -> None:
-    """Print validation summary to console."""
-    print("\n" + "=" * 60)
-    print("VALIDATION SUMMARY")
-    print("=" * 60)
+@functools.lru_cache(maxsize=1)
+def _tg_env() -> TelegramEnv:
+    """
+    Read and validate Telegram settings from the environment (once per process).
+
+    Returns:
+        TelegramEnv with parsed values
+
+    Raises:
+        ConfigError: If required variables are missing or TG_API_ID /
+            TG_CONCURRENCY are not valid integers
+    """
+    api_id = os.getenv("TG_API_ID")
+    api_hash = os.getenv("TG_API_HASH")
+    phone = os.getenv("TG_PHONE")
+
+    if not api_id or not api_hash or not phone:
+        raise ConfigError(
+            "Missing required environment variables.\n"
+            "\nPlease set the following in your .env file:\n"
+            "  - TG_API_ID\n"
+            "  - TG_API_HASH\n"
+            "  - TG_PHONE\n"
+            "\nGet API credentials from: https://my.telegram.org/apps"
+        )
+
+    try:
+        parsed_api_id = int(api_id)
+    except ValueError:
+        raise ConfigError(f"Invalid TG_API_ID: '{api_id}' must be an integer")
+
+    concurrency = os.getenv("TG_CONCURRENCY", "4").strip()
+    if not concurrency.isdigit() or int(concurrency) < 1:
+        raise ConfigError(f"Invalid TG_CONCURRENCY: '{concurrency}' must be a positive integer")
+
+    return TelegramEnv(
+        api_id=parsed_api_id,
+        api_hash=api_hash,
+        phone=phone,
+        two_fa_password=os.getenv("TG_2FA_PASSWORD"),
+        session_dir=os.getenv("TG_SESSION_DIR", "./data/telegram_session"),
+        concurrency=int(concurrency),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_traceback():
+    """Import the traceback module on first use (only error paths need it)."""
+    import traceback
+    return traceback
 
-    total = len(results)
-    joined = sum(1 for r in results if r["validation_status"] == "joined")
-    failed = sum(1 for r in results if r["validation_status"] == "join_failed")
-    blocked = sum(1 for r in results if r["validation_status"] == "blocked")
 
-    print(f"\nTotal sources checked: {total}")
-    print(f"[OK] Joined: {joined}")
-    print(f"[FAIL] Failed: {failed}")
-    print(f"[BLOCKED] Blocked: {blocked}")
+_STATUS_SYMBOL = {
+    "joined": "[OK]",
+    "join_failed": "[FAIL]",
+    "blocked": "[BLOCKED]",
+}
 
-    print("\n" + "-" * 60)
-    print("PER-SOURCE RESULTS:")
-    print("-" * 60)
 
-    for result in results:
-        status_symbol = {
-            "joined": "[OK]",
-            "join_failed": "[FAIL]",
-            "blocked": "[BLOCKED]",
-        }.get(result["validation_status"], "[?]")
+def _format_validation(result) -> str:
+    """Format one ValidationResult as a per-source summary block."""
+    lines = [
+        f"\n{_STATUS_SYMBOL.get(result.validation_status, '[?]')} {result.display_name} ({result.source_id})",
+        f"   Status: {result.validation_status}",
+        f"   Type: {result.source_type}",
+        f"   Messages readable: {result.messages_readable}",
+        f"   Message count: {result.message_count}",
+    ]
 
-        print(f"\n{status_symbol} {result['display_name']} ({result['source_id']})")
-        print(f"   Status: {result['validation_status']}")
-        print(f"   Type: {result.get('source_type', 'unknown')}")
-        print(f"   Messages readable: {result.get('messages_readable', False)}")
-        print(f"   Message count: {result.get('message_count', 0)}")
+    if result.last_error:
+        lines.append(f"   Error: {result.last_error}")
 
-        if result.get("last_error"):
-            print(f"   Error: {result['last_error']}")
+    if result.resolved_entity_id:
+        lines.append(f"   Entity ID: {result.resolved_entity_id} ({result.resolved_entity_type})")
 
-        if result.get("resolved_entity_id"):
-            print(f"   Entity ID: {result['resolved_entity_id']} ({result.get('resolved_entity_type', 'unknown')})")
+    if result.last_validated_at:
+        lines.append(f"   Validated at: {result.last_validated_at}")
 
-        if result.get("last_validated_at"):
-            print(f"   Validated at: {result['last_validated_at']}")
+    return "\n".join(lines)
+
+
+def _format_ingestion(result: dict) -> str:
+    """Format one ingestion result as a per-source summary block."""
+    status_symbol = "[OK]" if result.get("errors", 0) == 0 else "[FAIL]"
+
+    lines = [
+        f"\n{status_symbol} {result['display_name']} ({result['source_id']})",
+        f"   Type: {result.get('source_type', 'unknown')}",
+        f"   Fetched: {result.get('fetched', 0)}",
+        f"   Inserted: {result.get('new_inserted', 0)}",
+        f"   Skipped: {result.get('skipped', 0)}",
+        f"   High water mark: {result.get('high_water_mark', 'N/A')}",
+    ]
+
+    if result.get("error_message"):
+        lines.append(f"   Error: {result['error_message']}")
+
+    return "\n".join(lines)
+
+
+def print_summary(results: list, counts: Optional[Counter] = None) -> None:
+    """Print validation summary to console (counts: status tallies, if already kept)."""
+    if counts is None:
+        counts = Counter(r.validation_status for r in results)
+
+    lines = [
+        "\n" + "=" * 60,
+        "VALIDATION SUMMARY",
+        "=" * 60,
+        f"\nTotal sources checked: {len(results)}",
+        f"[OK] Joined: {counts['joined']}",
+        f"[FAIL] Failed: {counts['join_failed']}",
+        f"[BLOCKED] Blocked: {counts['blocked']}",
+        "\n" + "-" * 60,
+        "PER-SOURCE RESULTS:",
+        "-" * 60,
+    ]
+    lines.extend(map(_format_validation, results))
+
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def print_ingestion_summary(results: list) -> None:
+    """Print ingestion summary to console."""
+    from aijobscanner.telegram.ingest import summarize_ingestion
+
+    totals = summarize_ingestion(results)
+    lines = [
+        "\n" + "=" * 60,
+        "INGESTION SUMMARY",
+        "=" * 60,
+        f"\nTotal sources processed: {totals['total_sources']}",
+        f"Total messages fetched: {totals['total_fetched']}",
+        f"New messages inserted: {totals['total_inserted']}",
+        f"Messages skipped (duplicates/no text): {totals['total_skipped']}",
+        f"Errors: {totals['total_errors']}",
+        "\n" + "-" * 60,
+        "PER-SOURCE RESULTS:",
+        "-" * 60,
+    ]
+    lines.extend(map(_format_ingestion, results))
+
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _json_default(obj):
+    """JSON fallback for report payloads: dataclass results as dicts, else str()."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
+
+def _write_report_cached(write_report, results: list, report_dir: str) -> str:
+    """
+    Write a report unless an identical one already exists in report_dir.
+
+    Reports are indexed by a digest of their results in report_dir/index.json.
+    When the same results were already written, only the entry's last_seen_at
+    timestamp is refreshed and the existing report path is returned. Entries
+    whose report file has been deleted are pruned, and the index is swapped in
+    atomically so a crash mid-write can't truncate it.
+
+    Only use this for results without per-run fields (timestamps), which
+    would never match an earlier run.
+
+    Args:
+        write_report: Callable(results, report_dir) that writes the report and returns its path
+        results: Results list to write (dicts or dataclass instances)
+        report_dir: Report output directory
+
+    Returns:
+        Path to the (new or existing) report file
+    """
+    from aijobscanner.telegram.config import _replace_file
+
+    digest = hashlib.blake2b(
+        json.dumps(results, sort_keys=True, default=_json_default).encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+    index_path = Path(report_dir) / "index.json"
+    index = {}
+    if index_path.exists():
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+
+    # Drop entries for reports that were cleaned up since they were indexed
+    index = {
+        key: entry
+        for key, entry in index.items()
+        if isinstance(entry, dict) and Path(entry.get("path", "")).is_file()
+    }
+
+    now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    entry = index.get(digest)
+
+    if entry:
+        entry["last_seen_at"] = now
+        report_path = entry["path"]
+    else:
+        report_path = str(write_report(results, report_dir))
+        index[digest] = {"path": report_path, "written_at": now, "last_seen_at": now}
+
+    _replace_file(index_path, json.dumps(index, indent=2).encode("utf-8"))
+
+    return report_path
 
 
 async def validate_sources_command(args) -> int:
@@ -92,29 +282,32 @@ async def validate_sources_command(args) -> int:
     Returns:
         Exit code (0 for success, 1 for error)
     """
-    # Load environment variables
-    api_id = os.getenv("TG_API_ID")
-    api_hash = os.getenv("TG_API_HASH")
-    phone = os.getenv("TG_PHONE")
-    two_fa_password = os.getenv("TG_2FA_PASSWORD")
-    session_dir = os.getenv("TG_SESSION_DIR", "./data/telegram_session")
-
-    # Validate required environment variables
-    if not api_id or not api_hash or not phone:
-        print("[ERROR] Missing required environment variables.")
-        print("\nPlease set the following in your .env file:")
-        print("  - TG_API_ID")
-        print("  - TG_API_HASH")
-        print("  - TG_PHONE")
-        print("\nGet API credentials from: https://my.telegram.org/apps")
-        return 1
+    import asyncio
+    from aijobscanner.telegram import (
+        load_sources,
+        save_sources,
+        save_sources_preserving_comments,
+        get_enabled_sources,
+        index_sources,
+        update_source_validation,
+        SourceValidator,
+    )
+    from aijobscanner.telegram.daemon import (
+        connect_daemon,
+        default_socket_path,
+        validate_via_daemon,
+    )
 
+    # Load environment variables
     try:
-        api_id = int(api_id)
-    except ValueError:
-        print(f"[ERROR] Invalid TG_API_ID: '{api_id}' must be an integer")
+        env = _tg_env()
+    except ConfigError as e:
+        print(f"[ERROR] {e}")
         return 1
 
+    if args.daemon:
+        return await _serve_validation_daemon(env)
+
     # Load sources configuration
     try:
         config = load_sources(args.sources)
@@ -139,81 +332,194 @@ async def validate_sources_command(args) -> int:
 
     print(f"\n[INFO] Found {len(sources)} enabled source(s) to validate")
 
-    # Initialize validator
-    validator = SourceValidator(
-        api_id=api_id,
-        api_hash=api_hash,
-        phone=phone,
-        session_dir=session_dir,
-        two_fa_password=two_fa_password,
+    concurrency = args.concurrency if args.concurrency is not None else env.concurrency
+    if concurrency < 1:
+        print(f"[ERROR] --concurrency must be at least 1 (got {concurrency})")
+        return 1
+
+    apply_updates = args.write_back and not args.dry_run
+    source_index = index_sources(config) if apply_updates else None
+    changed_ids = set()
+    results = []
+
+    # Fail before talking to Telegram if comment-preserving write-back can't work
+    if apply_updates and args.preserve_comments:
+        try:
+            import ruamel.yaml  # noqa: F401
+        except ImportError:
+            print("[ERROR] --preserve-comments requires ruamel.yaml (pip install ruamel.yaml)")
+            return 1
+
+    def write_config() -> None:
+        if args.preserve_comments:
+            save_sources_preserving_comments(args.sources, config, changed_ids)
+        else:
+            save_sources(args.sources, config)
+
+    # Per-source progress log, appended as each result arrives so an
+    # interrupted run still leaves a record of what was validated
+    report_dir = Path(args.report_dir)
+    report_dir.mkdir(parents=True, exist_ok=True)
+    progress_path = report_dir / time.strftime(
+        "source_validation_%Y%m%d_%H%M%S.progress.jsonl", time.gmtime()
     )
 
+    validator = None
+
     try:
-        # Connect to Telegram
-        await validator.connect()
+        # Prefer a running daemon's already-connected session
+        socket_path = default_socket_path()
+        connection = await connect_daemon(socket_path)
+
+        if connection is not None:
+            print(f"[INFO] Using validation daemon at: {socket_path}")
+            result_stream = validate_via_daemon(
+                connection,
+                sources,
+                message_limit=args.limit,
+                concurrency=concurrency,
+            )
+        else:
+            validator = SourceValidator(
+                api_id=env.api_id,
+                api_hash=env.api_hash,
+                phone=env.phone,
+                session_dir=env.session_dir,
+                two_fa_password=env.two_fa_password,
+            )
 
-        # Validate all sources
-        results = await validator.validate_all(
-            sources=sources,
-            only_id=args.only,
-            message_limit=args.limit,
-        )
+            # Connect to Telegram
+            await validator.connect()
+
+            result_stream = validator.validate_iter(
+                sources=sources,
+                only_id=args.only,
+                message_limit=args.limit,
+                concurrency=concurrency,
+            )
+
+        # Validate sources, handling each result as soon as it is ready and
+        # tallying statuses on the way so the summaries needn't recount
+        status_counts = Counter()
+        with open(progress_path, "w", encoding="utf-8") as progress:
+            async for result in result_stream:
+                results.append(result)
+                status_counts[result.validation_status] += 1
+                progress.write(json.dumps(asdict(result), ensure_ascii=False, default=str) + "\n")
+                progress.flush()
+
+                if apply_updates:
+                    changed = update_source_validation(
+                        config,
+                        result.source_id,
+                        result.validation_status,
+                        result.last_validated_at,
+                        result.last_error,
+                        result.resolved_entity_id,
+                        result.resolved_entity_type,
+                        index=source_index,
+                    )
+                    if changed:
+                        changed_ids.add(result.source_id)
 
         if not results:
             print("\n⚠️  No validation results")
             return 1
 
-        # Disconnect
-        await validator.disconnect()
+        # Results arrive in completion order; report them in config order
+        source_order = {s.get("source_id"): idx for idx, s in enumerate(sources)}
+        results.sort(key=lambda r: source_order.get(r.source_id, len(source_order)))
 
         # Print summary
-        print_summary(results)
-
-        # Write report
-        report_path = validator.write_report(results, args.report_dir)
+        print_summary(results, status_counts)
+
+        # Write report off the event loop. Not cached: every result carries
+        # this run's last_validated_at, so no two runs ever match.
+        report_path = await asyncio.to_thread(
+            SourceValidator.write_report,
+            results,
+            args.report_dir,
+            status_counts=status_counts,
+        )
         print(f"\n[REPORT] Report written to: {report_path}")
+        print(f"[REPORT] Progress log: {progress_path}")
 
         # Write back to YAML if --write-back specified
         if args.write_back:
             if args.dry_run:
                 print("\n[DRY-RUN] Skipping YAML update (use --write-back without --dry-run)")
             else:
-                print(f"\n[SAVE] Updating YAML: {args.sources}")
-
-                for result in results:
-                    update_source_validation(
-                        config,
-                        result["source_id"],
-                        result["validation_status"],
-                        result["last_validated_at"],
-                        result.get("last_error"),
-                        result.get("resolved_entity_id"),
-                        result.get("resolved_entity_type"),
-                    )
-
-                save_sources(args.sources, config)
-                print("[OK] Configuration updated")
+                if changed_ids:
+                    print(f"\n[SAVE] Updating YAML: {args.sources}")
+                    write_config()
+                    print("[OK] Configuration updated")
+                else:
+                    print("\n[OK] No changes to write")
         else:
             if args.dry_run:
                 print("\n[DRY-RUN] YAML not modified (add --write-back to update)")
 
         return 0
 
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        # Under asyncio.run, Ctrl+C arrives here as a cancellation of the
+        # main task; returning normally lets asyncio.run hand back 130
         print("\n\n[INTERRUPTED] Validation cancelled by user")
-        await validator.disconnect()
+
+        if results:
+            print(f"[INFO] {len(results)} completed result(s) kept in: {progress_path}")
+            if changed_ids:
+                write_config()
+                print(f"[OK] Configuration updated for completed sources: {args.sources}")
+
         return 130
 
     except Exception as e:
         print(f"\n[ERROR] Validation failed: {e}")
-        import traceback
-        traceback.print_exc()
+        _get_traceback().print_exc()
+        return 1
+
+    finally:
+        if validator is not None:
+            try:
+                await validator.disconnect()
+            except Exception:
+                pass
 
-        try:
-            await validator.disconnect()
-        except:
-            pass
 
+async def _serve_validation_daemon(env: TelegramEnv) -> int:
+    """
+    Run validate-sources --daemon: keep one connected session and serve
+    validation requests from other CLI runs until interrupted.
+
+    Args:
+        env: Telegram settings from _tg_env()
+
+    Returns:
+        Exit code (0 when stopped by the user, 1 on error)
+    """
+    import asyncio
+
+    from aijobscanner.telegram import SourceValidator
+    from aijobscanner.telegram.daemon import default_socket_path, serve
+
+    try:
+        async with SourceValidator.shared(
+            api_id=env.api_id,
+            api_hash=env.api_hash,
+            phone=env.phone,
+            session_dir=env.session_dir,
+            two_fa_password=env.two_fa_password,
+        ) as validator:
+            await serve(validator, default_socket_path())
+        return 0
+
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\n[OK] Validation daemon stopped")
+        return 0
+
+    except Exception as e:
+        print(f"\n[ERROR] Validation daemon failed: {e}")
         return 1
 
 
@@ -227,27 +533,14 @@ async def ingest_sources_command(args) -> int:
     Returns:
         Exit code (0 for success, 1 for error)
     """
-    # Load environment variables
-    api_id = os.getenv("TG_API_ID")
-    api_hash = os.getenv("TG_API_HASH")
-    phone = os.getenv("TG_PHONE")
-    two_fa_password = os.getenv("TG_2FA_PASSWORD")
-    session_dir = os.getenv("TG_SESSION_DIR", "./data/telegram_session")
-
-    # Validate required environment variables
-    if not api_id or not api_hash or not phone:
-        print("[ERROR] Missing required environment variables.")
-        print("\nPlease set the following in your .env file:")
-        print("  - TG_API_ID")
-        print("  - TG_API_HASH")
-        print("  - TG_PHONE")
-        print("\nGet API credentials from: https://my.telegram.org/apps")
-        return 1
+    import asyncio
+    from aijobscanner.telegram import load_sources, get_enabled_sources, MessageIngestor
 
+    # Load environment variables
     try:
-        api_id = int(api_id)
-    except ValueError:
-        print(f"[ERROR] Invalid TG_API_ID: '{api_id}' must be an integer")
+        env = _tg_env()
+    except ConfigError as e:
+        print(f"[ERROR] {e}")
         return 1
 
     # Load sources configuration
@@ -267,13 +560,18 @@ async def ingest_sources_command(args) -> int:
 
     print(f"\n[INFO] Found {len(sources)} enabled source(s)")
 
+    concurrency = args.concurrency if args.concurrency is not None else env.concurrency
+    if concurrency < 1:
+        print(f"[ERROR] --concurrency must be at least 1 (got {concurrency})")
+        return 1
+
     # Initialize ingestor
     ingestor = MessageIngestor(
-        api_id=api_id,
-        api_hash=api_hash,
-        phone=phone,
-        session_dir=session_dir,
-        two_fa_password=two_fa_password,
+        api_id=env.api_id,
+        api_hash=env.api_hash,
+        phone=env.phone,
+        session_dir=env.session_dir,
+        two_fa_password=env.two_fa_password,
     )
 
     try:
@@ -291,46 +589,16 @@ async def ingest_sources_command(args) -> int:
             dry_run=args.dry_run,
             force=args.force,
             only_source=args.only,
+            concurrency=concurrency,
         )
 
-        # Disconnect
-        await ingestor.disconnect()
-
         # Print summary
-        print("\n" + "=" * 60)
-        print("INGESTION SUMMARY")
-        print("=" * 60)
-
-        total_fetched = sum(r.get("fetched", 0) for r in results)
-        total_inserted = sum(r.get("new_inserted", 0) for r in results)
-        total_skipped = sum(r.get("skipped", 0) for r in results)
-        total_errors = sum(r.get("errors", 0) for r in results)
-
-        print(f"\nTotal sources processed: {len(results)}")
-        print(f"Total messages fetched: {total_fetched}")
-        print(f"New messages inserted: {total_inserted}")
-        print(f"Messages skipped (duplicates/no text): {total_skipped}")
-        print(f"Errors: {total_errors}")
-
-        print("\n" + "-" * 60)
-        print("PER-SOURCE RESULTS:")
-        print("-" * 60)
-
-        for result in results:
-            status_symbol = "[OK]" if result.get("errors", 0) == 0 else "[FAIL]"
-
-            print(f"\n{status_symbol} {result['display_name']} ({result['source_id']})")
-            print(f"   Type: {result.get('source_type', 'unknown')}")
-            print(f"   Fetched: {result.get('fetched', 0)}")
-            print(f"   Inserted: {result.get('new_inserted', 0)}")
-            print(f"   Skipped: {result.get('skipped', 0)}")
-            print(f"   High water mark: {result.get('high_water_mark', 'N/A')}")
+        print_ingestion_summary(results)
 
-            if result.get("error_message"):
-                print(f"   Error: {result['error_message']}")
-
-        # Write report
-        report_path = ingestor.write_report(results, args.report_dir)
+        # Write report off the event loop
+        report_path = await asyncio.to_thread(
+            _write_report_cached, ingestor.write_report, results, args.report_dir
+        )
         print(f"\n[REPORT] Report written to: {report_path}")
 
         # Update project_track.md if requested
@@ -342,25 +610,31 @@ async def ingest_sources_command(args) -> int:
             )
             print("[OK] project_track.md updated")
 
+        # Rate-limited sources still fail the run (after the report is
+        # written) so schedulers notice and retry later
+        flood_waits = [r for r in results if r.get("flood_wait_seconds")]
+        if flood_waits:
+            longest = max(r["flood_wait_seconds"] for r in flood_waits)
+            print(f"\n[WARN] {len(flood_waits)} source(s) rate limited; retry in {longest}s or later")
+            return 1
+
         return 0
 
     except KeyboardInterrupt:
         print("\n\n[INTERRUPTED] Ingestion cancelled by user")
-        await ingestor.disconnect()
         return 130
 
     except Exception as e:
         print(f"\n[ERROR] Ingestion failed: {e}")
-        import traceback
-        traceback.print_exc()
+        _get_traceback().print_exc()
+        return 1
 
+    finally:
         try:
             await ingestor.disconnect()
-        except:
+        except Exception:
             pass
 
-        return 1
-
 
 def update_project_track_with_ingestion(
     project_track_path: str,
@@ -380,7 +654,7 @@ def update_project_track_with_ingestion(
             content = f.read()
 
         # Generate summary
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime())
 
         summary_lines = [
             f"\n**Last Run**: {timestamp}\n",
@@ -433,8 +707,12 @@ def classify_command(args) -> int:
     Returns:
         Exit code (0 for success, 1 for error)
     """
+    from aijobscanner.classify import MessageClassifier
+    from aijobscanner.classify.run import update_project_track_with_classification
+    from storage import get_classification_statistics
+
     # Initialize classifier
-    classifier = MessageClassifier(args.db)
+    classifier = MessageClassifier(args.db, audit_log=args.audit_log)
 
     try:
         # Connect to database
@@ -454,6 +732,7 @@ def classify_command(args) -> int:
             only_source_id=args.only,
             reprocess=args.reprocess,
             dry_run=args.dry_run,
+            batch_size=args.batch_size,
         )
 
         # Print summary
@@ -488,28 +767,23 @@ def classify_command(args) -> int:
             )
             print("[OK] project_track.md updated")
 
-        # Disconnect
-        classifier.disconnect()
-
         return 0
 
     except KeyboardInterrupt:
         print("\n\n[INTERRUPTED] Classification cancelled by user")
-        classifier.disconnect()
         return 130
 
     except Exception as e:
         print(f"\n[ERROR] Classification failed: {e}")
-        import traceback
-        traceback.print_exc()
+        _get_traceback().print_exc()
+        return 1
 
+    finally:
         try:
             classifier.disconnect()
-        except:
+        except Exception:
             pass
 
-        return 1
-
 
 def auto_apply_command(args) -> int:
     """
@@ -521,6 +795,10 @@ def auto_apply_command(args) -> int:
     Returns:
         Exit code (0 for success, 1 for error)
     """
+    from aijobscanner.apply.send import process_pending_sends
+    from aijobscanner.apply.outbox import OutboxManager
+    from storage import init_db
+
     # Validate required flags for sending
     if args.send and not args.yes_i_confirm:
         print("[ERROR] --send requires --yes-i-confirm")
@@ -543,9 +821,8 @@ def auto_apply_command(args) -> int:
         print("[WARN] *** SENDING MODE ENABLED ***")
         print("[WARN] This will send REAL emails to employers")
         print("[WARN] Press Ctrl+C to cancel within 5 seconds...")
-        import time as time_module
         try:
-            time_module.sleep(5)
+            time.sleep(5)
         except KeyboardInterrupt:
             print("\n\n[INTERRUPTED] Cancelled by user")
             return 130
@@ -610,13 +887,12 @@ def auto_apply_command(args) -> int:
 
     except Exception as e:
         print(f"\n[ERROR] Auto-apply failed: {e}")
-        import traceback
-        traceback.print_exc()
+        _get_traceback().print_exc()
         return 1
 
 
-def main():
-    """Main CLI entrypoint."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
         description="AI Job Scanner - Telegram Job Monitoring System",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -625,6 +901,9 @@ Examples:
   # Validate sources
   python -m aijobscanner validate-sources --dry-run
 
+  # Keep a validation session open for later runs (Unix only)
+  python -m aijobscanner validate-sources --daemon
+
   # Ingest messages (dry run)
   python -m aijobscanner ingest --dry-run
 
@@ -640,6 +919,7 @@ Environment Variables:
   TG_PHONE           Phone number for monitoring account (required)
   TG_2FA_PASSWORD    Two-factor password (if enabled on account)
   TG_SESSION_DIR     Session file directory (default: ./data/telegram_session)
+  TG_CONCURRENCY     Max sources validated at once (default: 4)
 
 For more information, see:
   - Validation: docs/runbooks/telegram_validation.md
@@ -658,8 +938,8 @@ For more information, see:
     validate_parser.add_argument(
         "--sources",
         type=str,
-        default="config/telegram_sources.yaml",
-        help="Path to telegram_sources.yaml (default: config/telegram_sources.yaml)",
+        default=DEFAULTS.sources_path,
+        help="Path to telegram_sources.yaml (default: %(default)s)",
     )
 
     validate_parser.add_argument(
@@ -674,6 +954,18 @@ For more information, see:
         help="Update YAML with validation results",
     )
 
+    validate_parser.add_argument(
+        "--preserve-comments",
+        action="store_true",
+        help="With --write-back, keep YAML comments and layout (needs ruamel.yaml; slower)",
+    )
+
+    validate_parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep a connected session open and serve validation requests from other runs",
+    )
+
     validate_parser.add_argument(
         "--only",
         type=str,
@@ -684,17 +976,26 @@ For more information, see:
     validate_parser.add_argument(
         "--report-dir",
         type=str,
-        default="data/reports",
-        help="Report output directory (default: data/reports)",
+        default=DEFAULTS.report_dir,
+        help="Report output directory (default: %(default)s)",
     )
 
     validate_parser.add_argument(
         "--limit",
         type=int,
-        default=5,
-        help="Number of messages to fetch for verification (default: 5)",
+        default=DEFAULTS.validate_limit,
+        help="Number of messages to fetch for verification (default: %(default)s)",
     )
 
+    validate_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Max sources validated at once (default: TG_CONCURRENCY or 4)",
+    )
+
+    validate_parser.set_defaults(func=validate_sources_command, _async=True)
+
     # ingest command
     ingest_parser = subparsers.add_parser(
         "ingest",
@@ -704,22 +1005,22 @@ For more information, see:
     ingest_parser.add_argument(
         "--sources",
         type=str,
-        default="config/telegram_sources.yaml",
-        help="Path to telegram_sources.yaml (default: config/telegram_sources.yaml)",
+        default=DEFAULTS.sources_path,
+        help="Path to telegram_sources.yaml (default: %(default)s)",
     )
 
     ingest_parser.add_argument(
         "--db",
         type=str,
-        default="data/db/aijobscanner.sqlite3",
-        help="Path to SQLite database (default: data/db/aijobscanner.sqlite3)",
+        default=DEFAULTS.db_path,
+        help="Path to SQLite database (default: %(default)s)",
     )
 
     ingest_parser.add_argument(
         "--limit-per-source",
         type=int,
-        default=200,
-        help="Maximum messages to fetch per source (default: 200)",
+        default=DEFAULTS.limit_per_source,
+        help="Maximum messages to fetch per source (default: %(default)s)",
     )
 
     ingest_parser.add_argument(
@@ -744,18 +1045,27 @@ For more information, see:
     ingest_parser.add_argument(
         "--report-dir",
         type=str,
-        default="data/reports",
-        help="Report output directory (default: data/reports)",
+        default=DEFAULTS.report_dir,
+        help="Report output directory (default: %(default)s)",
+    )
+
+    ingest_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Max sources ingested at once (default: TG_CONCURRENCY or 4)",
     )
 
     ingest_parser.add_argument(
         "--update-project-track",
         type=str,
         nargs="?",
-        const="project_track.md",
-        help="Update project_track.md with ingestion summary (default path: project_track.md)",
+        const=DEFAULTS.project_track_path,
+        help="Update project_track.md with ingestion summary (default path: %(const)s)",
     )
 
+    ingest_parser.set_defaults(func=ingest_sources_command, _async=True)
+
     # classify command
     classify_parser = subparsers.add_parser(
         "classify",
@@ -765,15 +1075,15 @@ For more information, see:
     classify_parser.add_argument(
         "--db",
         type=str,
-        default="data/db/aijobscanner.sqlite3",
-        help="Path to SQLite database (default: data/db/aijobscanner.sqlite3)",
+        default=DEFAULTS.db_path,
+        help="Path to SQLite database (default: %(default)s)",
     )
 
     classify_parser.add_argument(
         "--limit",
         type=int,
-        default=500,
-        help="Maximum messages to classify (default: 500)",
+        default=DEFAULTS.classify_limit,
+        help="Maximum messages to classify (default: %(default)s)",
     )
 
     classify_parser.add_argument(
@@ -789,34 +1099,51 @@ For more information, see:
         help="Reprocess already-classified messages",
     )
 
+    classify_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULTS.batch_size,
+        help="Messages classified and written per batch (default: %(default)s)",
+    )
+
     classify_parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Classify without writing to database",
     )
 
+    classify_parser.add_argument(
+        "--audit-log",
+        type=str,
+        metavar="PATH",
+        help="Append the classification audit trail to this JSONL file "
+             "instead of the message_classifications table",
+    )
+
     classify_parser.add_argument(
         "--export-dir",
         type=str,
-        default="data/review",
-        help="CSV export directory (default: data/review)",
+        default=DEFAULTS.export_dir,
+        help="CSV export directory (default: %(default)s)",
     )
 
     classify_parser.add_argument(
         "--export-limit",
         type=int,
-        default=100,
-        help="Maximum candidates to export (default: 100)",
+        default=DEFAULTS.export_limit,
+        help="Maximum candidates to export (default: %(default)s)",
     )
 
     classify_parser.add_argument(
         "--update-project-track",
         type=str,
         nargs="?",
-        const="project_track.md",
-        help="Update project_track.md with classification summary (default path: project_track.md)",
+        const=DEFAULTS.project_track_path,
+        help="Update project_track.md with classification summary (default path: %(const)s)",
     )
 
+    classify_parser.set_defaults(func=classify_command, _async=False)
+
     # auto-apply command
     apply_parser = subparsers.add_parser(
         "auto-apply",
@@ -826,29 +1153,29 @@ For more information, see:
     apply_parser.add_argument(
         "--db",
         type=str,
-        default="data/db/aijobscanner.sqlite3",
-        help="Path to SQLite database (default: data/db/aijobscanner.sqlite3)",
+        default=DEFAULTS.db_path,
+        help="Path to SQLite database (default: %(default)s)",
     )
 
     apply_parser.add_argument(
         "--applicants",
         type=str,
-        default="config/applicants.yaml",
-        help="Path to applicants.yaml config (default: config/applicants.yaml)",
+        default=DEFAULTS.applicants_path,
+        help="Path to applicants.yaml config (default: %(default)s)",
     )
 
     apply_parser.add_argument(
         "--outbox-dir",
         type=str,
-        default="data/outbox",
-        help="Outbox directory (default: data/outbox)",
+        default=DEFAULTS.outbox_dir,
+        help="Outbox directory (default: %(default)s)",
     )
 
     apply_parser.add_argument(
         "--limit",
         type=int,
-        default=50,
-        help="Maximum messages to process (default: 50)",
+        default=DEFAULTS.apply_limit,
+        help="Maximum messages to process (default: %(default)s)",
     )
 
     apply_parser.add_argument(
@@ -872,37 +1199,69 @@ For more information, see:
     apply_parser.add_argument(
         "--max-per-run",
         type=int,
-        default=10,
-        help="Maximum emails to send this run (default: 10)",
+        default=DEFAULTS.max_per_run,
+        help="Maximum emails to send this run (default: %(default)s)",
     )
 
-    args = parser.parse_args()
+    apply_parser.set_defaults(func=auto_apply_command, _async=False)
 
-    if not args.command:
+    return parser
+
+
+def _run_async(coro):
+    """
+    Run a Telethon command coroutine, on uvloop's faster event loop when available.
+
+    uvloop is optional and not supported on Windows; the default asyncio
+    loop is used there.
+
+    Args:
+        coro: Command coroutine to run
+
+    Returns:
+        The coroutine's result (the command's exit code)
+    """
+    import asyncio
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
+def main():
+    """Main CLI entrypoint."""
+    parser = _build_parser()
+
+    # Answer bare invocations and --help before loading .env or other setup
+    if len(sys.argv) == 1:
         parser.print_help()
         return 1
 
-    if args.command == "validate-sources":
-        # Run async command
-        exit_code = asyncio.run(validate_sources_command(args))
-        return exit_code
-    elif args.command == "ingest":
-        # Run async command
-        exit_code = asyncio.run(ingest_sources_command(args))
-        return exit_code
-    elif args.command == "classify":
-        # Run classify command (sync)
-        exit_code = classify_command(args)
-        return exit_code
-    elif args.command == "auto-apply":
-        # Run auto-apply command (sync)
-        exit_code = auto_apply_command(args)
-        return exit_code
-    else:
-        print(f"[ERROR] Unknown command: {args.command}")
+    if sys.argv[1] in ("-h", "--help"):
+        parser.print_help()
+        return 0
+
+    args = parser.parse_args()
+
+    if not args.command:
         parser.print_help()
         return 1
 
+    # Load environment variables from .env file (once per process tree;
+    # the marker is inherited by re-invocations and child processes)
+    if os.getenv("AIJS_DOTENV_LOADED") != "1":
+        from dotenv import load_dotenv
+        load_dotenv()
+        os.environ["AIJS_DOTENV_LOADED"] = "1"
+
+    if args._async:
+        return _run_async(args.func(args))
+    return args.func(args)
+
 
 if __name__ == "__main__":
     sys.exit(main())
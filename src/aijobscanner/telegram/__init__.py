@@ -7,16 +7,37 @@ Handles Telegram client operations including:
 - Session management
 """
 
-from .config import load_sources, save_sources, get_enabled_sources, update_source_validation
-from .validate import SourceValidator
-from .ingest import MessageIngestor, sanitize_text
+from .config import (
+    load_sources,
+    save_sources,
+    save_sources_preserving_comments,
+    get_enabled_sources,
+    index_sources,
+    update_source_validation,
+)
+from .sanitize import sanitize_text
 
 __all__ = [
     "load_sources",
     "save_sources",
+    "save_sources_preserving_comments",
     "get_enabled_sources",
+    "index_sources",
     "update_source_validation",
     "SourceValidator",
+    "ValidationResult",
     "MessageIngestor",
     "sanitize_text",
 ]
+
+
+def __getattr__(name):
+    # Telethon-backed classes are imported on first use so that importing
+    # the package for config helpers stays cheap
+    if name in ("SourceValidator", "ValidationResult"):
+        from . import validate
+        return getattr(validate, name)
+    if name == "MessageIngestor":
+        from .ingest import MessageIngestor
+        return MessageIngestor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,15 +4,122 @@ Configuration management for Telegram sources.
 Handles loading and saving of the telegram_sources.yaml file.
 """
 
+import hashlib
+import io
+import os
+import pickle
+import tempfile
 import yaml
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
+
+# Prefer libyaml's C parser/emitter when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# Fields every source entry must define
+REQUIRED_SOURCE_FIELDS = ("source_id", "display_name", "type")
+
+# Fields written back by update_source_validation()
+VALIDATION_FIELDS = (
+    "validation_status",
+    "last_validated_at",
+    "last_error",
+    "resolved_entity_id",
+    "resolved_entity_type",
+)
+
+
+def _validate_sources(data: Dict[str, Any]) -> None:
+    """
+    Check the parsed configuration has the expected shape.
+
+    Raises:
+        ValueError: If the sources list or a required field is missing
+    """
+    # Validate required top-level structure
+    if "sources" not in data:
+        raise ValueError("Missing required 'sources' key in configuration")
+
+    if not isinstance(data["sources"], list):
+        raise ValueError("'sources' must be a list")
+
+    # Validate each source has required fields
+    for idx, source in enumerate(data["sources"]):
+        if not isinstance(source, dict):
+            raise ValueError(f"Source at index {idx} is not a dictionary")
+
+        for field in REQUIRED_SOURCE_FIELDS:
+            if field not in source:
+                raise ValueError(
+                    f"Source at index {idx} missing required field: {field}"
+                )
+
+
+def cache_dir() -> Path:
+    """
+    Per-user cache directory for AI Job Scanner.
+
+    $XDG_CACHE_HOME/aijobscanner, defaulting to ~/.cache/aijobscanner, so
+    caches and runtime files stay out of the repository.
+    """
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(cache_root) / "aijobscanner"
+
+
+def _parse_cache_path(config_path: Path) -> Path:
+    """Location of the parsed-config cache, keyed on the resolved YAML path."""
+    key = hashlib.blake2b(
+        str(config_path.resolve()).encode("utf-8"), digest_size=8
+    ).hexdigest()
+    return cache_dir() / f"sources-{key}.pickle"
+
+
+def _read_parse_cache(cache_path: Path, st: os.stat_result) -> Optional[Dict[str, Any]]:
+    """Return cached config if it matches the file's mtime and size."""
+    try:
+        with open(cache_path, "rb") as f:
+            mtime_ns, size, data = pickle.load(f)
+    except Exception:
+        return None
+
+    if mtime_ns != st.st_mtime_ns or size != st.st_size:
+        return None
+
+    return data
+
+
+def _write_parse_cache(cache_path: Path, st: os.stat_result, data: Dict[str, Any]) -> None:
+    """Atomically store parsed config; failures only cost a reparse."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(
+                    (st.st_mtime_ns, st.st_size, data),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
 
 
 def load_sources(path: str) -> Dict[str, Any]:
     """
     Load Telegram sources from YAML file.
 
+    The parsed result is cached on disk keyed by the file's mtime and
+    size, so unchanged configs skip YAML parsing on later runs.
+
     Args:
         path: Path to telegram_sources.yaml
 
@@ -31,41 +138,65 @@ def load_sources(path: str) -> Dict[str, Any]:
     if not config_path.exists():
         raise FileNotFoundError(f"Configuration file not found: {path}")
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    st = config_path.stat()
+    cache_path = _parse_cache_path(config_path)
+
+    # Cached entries were validated before being written
+    cached = _read_parse_cache(cache_path, st)
+    if cached is not None:
+        return cached
+
+    # Parse the raw bytes in one call so libyaml never goes through
+    # Python-level stream reads
+    data = yaml.load(config_path.read_bytes(), Loader=_YamlLoader)
 
     if not data:
         raise ValueError(f"Configuration file is empty: {path}")
 
-    # Validate required top-level structure
-    if "sources" not in data:
-        raise ValueError("Missing required 'sources' key in configuration")
+    _validate_sources(data)
 
-    if not isinstance(data["sources"], list):
-        raise ValueError("'sources' must be a list")
+    _write_parse_cache(cache_path, st, data)
 
-    # Validate each source has required fields
-    for idx, source in enumerate(data["sources"]):
-        if not isinstance(source, dict):
-            raise ValueError(f"Source at index {idx} is not a dictionary")
+    return data
 
-        required_fields = ["source_id", "display_name", "type"]
-        for field in required_fields:
-            if field not in source:
-                raise ValueError(
-                    f"Source at index {idx} missing required field: {field}"
-                )
 
-    return data
+def _replace_file(config_path: Path, payload: bytes) -> None:
+    """
+    Atomically replace config_path with payload.
+
+    Writes to a temp file next to the target, fsyncs and swaps it in, so
+    readers never see a half-written config. Keeps the existing file's
+    permissions (mkstemp creates files as 0600).
+    """
+    # Ensure parent directory exists
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        mode = config_path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o644
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=config_path.parent, prefix=f".{config_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, config_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 def save_sources(path: str, data: Dict[str, Any]) -> None:
     """
     Save Telegram sources to YAML file.
 
-    Note: This will overwrite the existing file and may not preserve
-    all comments. For production use, consider using a library that
-    preserves comments like ruamel.yaml.
+    The file is replaced atomically. Note: this does not preserve
+    comments; use save_sources_preserving_comments() when they matter.
 
     Args:
         path: Path to save telegram_sources.yaml
@@ -74,13 +205,67 @@ def save_sources(path: str, data: Dict[str, Any]) -> None:
     Raises:
         IOError: If file cannot be written
     """
+    # Serialize in memory first so the file is written in one go
+    payload = yaml.dump(
+        data,
+        Dumper=_YamlDumper,
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+        encoding="utf-8",
+    )
+
+    _replace_file(Path(path), payload)
+
+
+def save_sources_preserving_comments(
+    path: str,
+    data: Dict[str, Any],
+    source_ids: Iterable[str],
+) -> None:
+    """
+    Write validation fields for selected sources, keeping comments and layout.
+
+    Re-reads the file with ruamel.yaml's round-trip loader and copies only
+    the validation fields of the given sources from data, so everything
+    else in the file is left as the user wrote it. Much slower than
+    save_sources(), so only use it when comments need to survive.
+
+    Args:
+        path: Path to telegram_sources.yaml
+        data: Updated configuration dictionary from load_sources()
+        source_ids: IDs of sources whose validation fields changed
+
+    Raises:
+        ImportError: If ruamel.yaml is not installed
+        IOError: If file cannot be read or written
+    """
+    from ruamel.yaml import YAML
+
     config_path = Path(path)
+    source_ids = set(source_ids)
+    updated = index_sources(data)
 
-    # Ensure parent directory exists
-    config_path.parent.mkdir(parents=True, exist_ok=True)
+    rt_yaml = YAML(typ="rt")
+    rt_yaml.preserve_quotes = True
+    tree = rt_yaml.load(config_path.read_text(encoding="utf-8"))
+
+    for source in tree.get("sources", []):
+        source_id = source.get("source_id")
+        if source_id not in source_ids or source_id not in updated:
+            continue
+
+        new_source = updated[source_id]
+        for field in VALIDATION_FIELDS:
+            if field in new_source:
+                source[field] = new_source[field]
+            elif field in source:
+                del source[field]
 
-    with open(config_path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    buffer = io.StringIO()
+    rt_yaml.dump(tree, buffer)
+
+    _replace_file(config_path, buffer.getvalue().encode("utf-8"))
 
 
 def get_enabled_sources(data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -122,6 +307,22 @@ def find_source_by_id(data: Dict[str, Any], source_id: str) -> Optional[Dict[str
     return None
 
 
+def index_sources(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """
+    Build a source_id -> source lookup for repeated access.
+
+    Args:
+        data: Configuration dictionary from load_sources()
+
+    Returns:
+        Dictionary mapping source_id to the (shared, mutable) source dict
+    """
+    return {
+        source["source_id"]: source
+        for source in data.get("sources", [])
+    }
+
+
 def update_source_validation(
     data: Dict[str, Any],
     source_id: str,
@@ -130,10 +331,14 @@ def update_source_validation(
     last_error: Optional[str] = None,
     resolved_entity_id: Optional[int] = None,
     resolved_entity_type: Optional[str] = None,
+    index: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> bool:
     """
     Update validation fields for a specific source.
 
+    Only mutates the in-memory configuration; call save_sources() once
+    after all updates to write the file.
+
     Args:
         data: Configuration dictionary from load_sources()
         source_id: Unique source identifier
@@ -142,28 +347,48 @@ def update_source_validation(
         last_error: Error message if validation failed
         resolved_entity_id: Telegram entity ID
         resolved_entity_type: Entity type (channel|group)
+        index: Optional lookup from index_sources(); avoids a linear scan
+            when updating many sources
 
     Returns:
-        True if source was found and updated, False otherwise
+        True if the status, error or entity fields changed, False if the
+        source was not found or already held these values. A new
+        last_validated_at alone is applied but does not count as a change,
+        so unchanged re-runs can skip rewriting the file.
     """
-    sources = data.get("sources", [])
+    if index is not None:
+        source = index.get(source_id)
+    else:
+        source = find_source_by_id(data, source_id)
 
-    for source in sources:
-        if source.get("source_id") == source_id:
-            source["validation_status"] = validation_status
-            source["last_validated_at"] = last_validated_at
+    if source is None:
+        return False
+
+    # Stamped every run, so it never decides whether the file needs writing
+    source["last_validated_at"] = last_validated_at
+
+    updates = {
+        "validation_status": validation_status,
+    }
+
+    if last_error:
+        updates["last_error"] = last_error
+
+    if resolved_entity_id:
+        updates["resolved_entity_id"] = resolved_entity_id
 
-            if last_error:
-                source["last_error"] = last_error
-            elif "last_error" in source:
-                del source["last_error"]
+    if resolved_entity_type:
+        updates["resolved_entity_type"] = resolved_entity_type
 
-            if resolved_entity_id:
-                source["resolved_entity_id"] = resolved_entity_id
+    changed = False
 
-            if resolved_entity_type:
-                source["resolved_entity_type"] = resolved_entity_type
+    for key, value in updates.items():
+        if source.get(key) != value:
+            source[key] = value
+            changed = True
 
-            return True
+    if not last_error and "last_error" in source:
+        del source["last_error"]
+        changed = True
 
-    return False
+    return changed
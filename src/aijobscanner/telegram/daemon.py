@@ -0,0 +1,173 @@
+"""
+Long-running validation daemon for AI Job Scanner.
+
+Keeps one authenticated SourceValidator connected and serves validation
+requests from short-lived CLI runs over a Unix socket, so repeated runs
+skip Telethon's connect and handshake.
+
+Protocol (one JSON object per line):
+    request:  {"cmd": "validate", "sources": [...], "message_limit": 1, "concurrency": 4}
+    response: {"result": {...}} per source as it completes, then {"done": true},
+              or {"error": "..."} if the request failed
+"""
+
+import asyncio
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .config import cache_dir
+from .validate import SourceValidator, ValidationResult
+
+
+def default_socket_path() -> Path:
+    """Socket the daemon listens on: <cache dir>/validator.sock."""
+    return cache_dir() / "validator.sock"
+
+
+def _encode(message: Dict[str, Any]) -> bytes:
+    """Encode one protocol message as a JSON line."""
+    return (json.dumps(message, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+async def connect_daemon(
+    socket_path: Path,
+) -> Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]:
+    """
+    Connect to a running daemon.
+
+    Args:
+        socket_path: Daemon socket path
+
+    Returns:
+        (reader, writer) pair, or None if no daemon is listening or Unix
+        sockets are unavailable on this platform
+    """
+    if not hasattr(asyncio, "open_unix_connection"):
+        return None
+
+    try:
+        return await asyncio.open_unix_connection(str(socket_path))
+    except OSError:
+        return None
+
+
+async def validate_via_daemon(
+    connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+    sources: List[Dict[str, Any]],
+    message_limit: int = 1,
+    concurrency: int = 4,
+) -> AsyncIterator[ValidationResult]:
+    """
+    Ask the daemon to validate sources, yielding results as they complete.
+
+    Args:
+        connection: (reader, writer) from connect_daemon()
+        sources: List of source dictionaries
+        message_limit: Number of messages to fetch to verify readability
+        concurrency: Maximum number of sources validated at once
+
+    Yields:
+        ValidationResult objects in completion order
+
+    Raises:
+        RuntimeError: If the daemon reports an error
+        ConnectionError: If the daemon closes the connection early
+    """
+    reader, writer = connection
+
+    try:
+        writer.write(_encode({
+            "cmd": "validate",
+            "sources": sources,
+            "message_limit": message_limit,
+            "concurrency": concurrency,
+        }))
+        await writer.drain()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Validation daemon closed the connection")
+
+            message = json.loads(line)
+
+            if "result" in message:
+                yield ValidationResult(**message["result"])
+            elif "error" in message:
+                raise RuntimeError(f"Validation daemon error: {message['error']}")
+            else:
+                return
+    finally:
+        writer.close()
+
+
+async def serve(validator: SourceValidator, socket_path: Path) -> None:
+    """
+    Serve validation requests until cancelled.
+
+    The validator must already be connected. Requests are handled one at a
+    time so concurrent CLI runs don't multiply the request rate.
+
+    Args:
+        validator: Connected SourceValidator
+        socket_path: Socket path to listen on
+
+    Raises:
+        RuntimeError: If Unix sockets are unavailable or another daemon is
+            already listening on socket_path
+    """
+    if not hasattr(asyncio, "start_unix_server"):
+        raise RuntimeError("The validation daemon requires Unix domain sockets")
+
+    if await connect_daemon(socket_path) is not None:
+        raise RuntimeError(f"A validation daemon is already running at {socket_path}")
+
+    # Remove a socket left behind by a daemon that didn't shut down cleanly
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    if socket_path.exists():
+        socket_path.unlink()
+
+    lock = asyncio.Lock()
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = json.loads(await reader.readline())
+            if request.get("cmd") != "validate":
+                raise ValueError(f"Unknown command: {request.get('cmd')!r}")
+
+            async with lock:
+                async for result in validator.validate_iter(
+                    request["sources"],
+                    message_limit=request.get("message_limit", 1),
+                    concurrency=request.get("concurrency", 4),
+                ):
+                    writer.write(_encode({"result": asdict(result)}))
+                    await writer.drain()
+
+            writer.write(_encode({"done": True}))
+        except Exception as e:
+            writer.write(_encode({"error": str(e)}))
+        finally:
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle, path=str(socket_path))
+    # The daemon acts with the account's session; keep the socket private
+    os.chmod(socket_path, 0o600)
+
+    print(f"[OK] Validation daemon listening on: {socket_path}")
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
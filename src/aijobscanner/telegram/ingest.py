@@ -9,11 +9,12 @@ Handles incremental message reading from Telegram sources with:
 """
 
 import os
-import re
 import json
+import time
 import asyncio
-from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
 from telethon import TelegramClient, errors
@@ -24,54 +25,48 @@ from pathlib import Path
 # Add parent directories to path for storage module
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from storage import init_db, get_cursor, upsert_cursor, insert_message_if_new
+from storage import MessageRow, init_db, close_db, get_cursor, upsert_cursor, insert_messages_batch
 
+from .sanitize import sanitize_text
 
-def sanitize_text(text: str) -> Tuple[str, Dict[str, bool]]:
-    """
-    Sanitize message text to avoid persisting sensitive data.
+# orjson is optional; it writes the report noticeably faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rows buffered before each executemany while messages are streamed in
+INSERT_BATCH_SIZE = 50
 
-    Redacts patterns that look like:
-    - Login codes (5-6 digits)
-    - Telegram verification codes
-    - Password reset codes
-    - Verification codes
+
+def summarize_ingestion(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Total up ingestion results in a single pass.
 
     Args:
-        text: Original message text
+        results: List of ingestion results (one per source)
 
     Returns:
-        Tuple of (sanitized_text, flags_dict)
+        Dict with total_sources, total_fetched, total_inserted,
+        total_skipped, total_errors and sources_with_errors
     """
-    if not text:
-        return "", {}
-
-    patterns = [
-        # "login code" + 5-6 digits
-        (r'login code\s+(\d{5,6})', '[LOGIN CODE REDACTED]'),
-        # "Telegram code" + 5-6 digits
-        (r'Telegram code\s+(\d{5,6})', '[TELEGRAM CODE REDACTED]'),
-        # "code:" + 5-6 digits
-        (r'code:\s*(\d{5,6})', 'code: [REDACTED]'),
-        # "verification code:" + 5-6 digits
-        (r'verification code:\s*(\d{5,6})', 'verification code: [REDACTED]'),
-        # "reset code" + 5-6 digits
-        (r'reset code\s+(\d{5,6})', '[RESET CODE REDACTED]'),
-    ]
-
-    sanitized = text
-    flags = {"sanitized": False}
-
-    for pattern, replacement in patterns:
-        if re.search(pattern, sanitized, re.IGNORECASE):
-            flags["sanitized"] = True
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                # Keep the format but redact digits
-                redacted = re.sub(r'\d{5,6}', '[REDACTED]', match.group(0))
-                sanitized = re.sub(pattern, redacted, sanitized, flags=re.IGNORECASE)
-
-    return sanitized, flags
+    fetched = inserted = skipped = errors = sources_with_errors = 0
+    for r in results:
+        fetched += r.get("fetched", 0)
+        inserted += r.get("new_inserted", 0)
+        skipped += r.get("skipped", 0)
+        e = r.get("errors", 0)
+        errors += e
+        sources_with_errors += e > 0
+
+    return {
+        "total_sources": len(results),
+        "total_fetched": fetched,
+        "total_inserted": inserted,
+        "total_skipped": skipped,
+        "total_errors": errors,
+        "sources_with_errors": sources_with_errors,
+    }
 
 
 class MessageIngestor:
@@ -123,6 +118,14 @@ class MessageIngestor:
             api_hash,
         )
 
+        # Resolved entities keyed by resolved_entity_id or public_handle,
+        # so repeated ingest_source calls skip the get_entity round-trip
+        self._entity_cache: Dict[Any, Any] = {}
+
+        # Single DB thread used by ingest_all; it owns the SQLite connection
+        # and serializes writes without blocking the event loop
+        self._db_executor: Optional[ThreadPoolExecutor] = None
+
     async def connect(self) -> None:
         """
         Connect to Telegram using existing session.
@@ -149,7 +152,8 @@ class MessageIngestor:
         Resolve Telegram entity from source config.
 
         Uses resolved_entity_id if available (from validation step),
-        otherwise falls back to public_handle or invite_link.
+        otherwise falls back to public_handle or invite_link. Results are
+        cached for the lifetime of the ingestor.
 
         Args:
             source_config: Source configuration dict
@@ -157,16 +161,15 @@ class MessageIngestor:
         Returns:
             Telegram entity (Chat, Channel, etc.)
         """
-        # Prefer resolved_entity_id from validation
-        if source_config.get("resolved_entity_id"):
-            entity_id = source_config["resolved_entity_id"]
-            # For channels, need to use entity ID directly
-            return await self.client.get_entity(entity_id)
-
-        # Fall back to public_handle
-        if source_config.get("public_handle"):
-            handle = source_config["public_handle"]
-            return await self.client.get_entity(handle)
+        # Prefer resolved_entity_id from validation, then public_handle
+        key = source_config.get("resolved_entity_id") or source_config.get("public_handle")
+        if key:
+            entity = self._entity_cache.get(key)
+            if entity is None:
+                # For channels, need to use entity ID directly
+                entity = await self.client.get_entity(key)
+                self._entity_cache[key] = entity
+            return entity
 
         # Fall back to invite link (for groups)
         if source_config.get("invite_link"):
@@ -181,6 +184,53 @@ class MessageIngestor:
             "no resolved_entity_id, public_handle, or invite_link"
         )
 
+    async def _db_call(self, func, *args, **kwargs):
+        """
+        Run a storage call on the DB thread, or inline if there is none.
+
+        Args:
+            func: Storage function taking the connection as first argument
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns
+        """
+        if self._db_executor is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._db_executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _store_rows(
+        self,
+        db_conn,
+        rows: List[MessageRow],
+        result: Dict[str, Any],
+        dry_run: bool,
+    ) -> None:
+        """
+        Insert a batch of message rows and update the result counters.
+
+        Args:
+            db_conn: SQLite database connection
+            rows: MessageRow tuples
+            result: Ingestion result dict to update
+            dry_run: If True, count rows as inserted without writing
+        """
+        if not rows:
+            return
+
+        # Insert to database (idempotent - existing messages are ignored)
+        if not dry_run:
+            inserted = await self._db_call(insert_messages_batch, db_conn, rows)
+            result["new_inserted"] += inserted
+            result["skipped"] += len(rows) - inserted
+        else:
+            # Dry run - count as would be inserted
+            result["new_inserted"] += len(rows)
+
     async def ingest_source(
         self,
         source_config: Dict[str, Any],
@@ -211,6 +261,7 @@ class MessageIngestor:
             "errors": 0,
             "high_water_mark": None,
             "error_message": None,
+            "flood_wait_seconds": None,
         }
 
         try:
@@ -219,7 +270,7 @@ class MessageIngestor:
                 last_message_id = 0
                 last_message_date = None
             else:
-                cursor = get_cursor(db_conn, source_id)
+                cursor = await self._db_call(get_cursor, db_conn, source_id)
 
                 if cursor is None:
                     last_message_id = 0
@@ -243,23 +294,67 @@ class MessageIngestor:
 
             print(f"   [INFO] Fetching messages (limit={limit}, min_id={last_message_id + 1})")
 
-            # Fetch messages incrementally (only NEW messages)
-            messages = []
-            async for message in self.client.iter_messages(
+            # Source-constant permalink template, e.g. https://t.me/handle/{}
+            handle = source_config.get("public_handle")
+            permalink_tmpl = f"https://t.me/{handle}/{{}}".format if handle else None
+
+            # Fetch messages incrementally (only NEW messages), building rows
+            # as they arrive and flushing them to the DB in small batches
+            rows = []
+            high_water_mark = last_message_id
+            latest_date = None
+            async for msg in self.client.iter_messages(
                 entity,
                 limit=limit,
                 min_id=last_message_id,  # Only fetch messages newer than cursor
                 reverse=True,  # Fetch in chronological order
             ):
-                messages.append(message)
+                result["fetched"] += 1
+                # Message IDs grow with post date, so the newest message's
+                # date goes with the high water mark
+                if msg.id > high_water_mark:
+                    high_water_mark = msg.id
+                    latest_date = msg.date
+
+                # Skip messages without text (e.g., media-only); the raw
+                # message check avoids unparsing entities into msg.text
+                if not msg.message:
+                    result["skipped"] += 1
+                    continue
 
-            result["fetched"] = len(messages)
+                try:
+                    # Sanitize text; raw_json is built by SQLite from the
+                    # message fields plus the original text
+                    text = msg.text
+                    sanitized_text, flags = sanitize_text(text)
+
+                    rows.append(MessageRow(
+                        source_id,
+                        tg_chat_id,
+                        msg.id,
+                        msg.date.isoformat() if msg.date else None,
+                        msg.sender_id,
+                        sanitized_text,
+                        permalink_tmpl(msg.id) if permalink_tmpl else None,
+                        text,
+                    ))
+
+                except Exception as e:
+                    print(f"   [WARN] Error processing message {msg.id}: {e}")
+                    result["errors"] += 1
+
+                if len(rows) >= INSERT_BATCH_SIZE:
+                    await self._store_rows(db_conn, rows, result, dry_run)
+                    rows = []
 
-            if not messages:
+            await self._store_rows(db_conn, rows, result, dry_run)
+
+            if not result["fetched"]:
                 print(f"   [INFO] No new messages")
                 result["high_water_mark"] = last_message_id
                 if not dry_run:
-                    upsert_cursor(
+                    await self._db_call(
+                        upsert_cursor,
                         db_conn,
                         source_id,
                         tg_chat_id,
@@ -269,67 +364,15 @@ class MessageIngestor:
                     )
                 return result
 
-            # Process each message
-            for msg in messages:
-                try:
-                    # Skip messages without text (e.g., media-only)
-                    if not msg.text:
-                        result["skipped"] += 1
-                        continue
-
-                    # Build message dict
-                    msg_dict = {
-                        "tg_chat_id": tg_chat_id,
-                        "tg_message_id": msg.id,
-                        "date": msg.date.isoformat() if msg.date else None,
-                        "sender_id": msg.sender_id,
-                        "permalink": f"https://t.me/{source_config.get('public_handle', 'c')}/{msg.id}" if source_config.get("public_handle") else None,
-                    }
-
-                    # Sanitize text
-                    sanitized_text, flags = sanitize_text(msg.text)
-
-                    # Convert to JSON for raw storage
-                    raw_json = json.dumps({
-                        "id": msg.id,
-                        "date": msg.date.isoformat() if msg.date else None,
-                        "message": msg.text,
-                        "sender_id": msg.sender_id,
-                    }, ensure_ascii=False)
-
-                    # Insert to database (idempotent)
-                    if not dry_run:
-                        inserted = insert_message_if_new(
-                            db_conn,
-                            source_id,
-                            msg_dict,
-                            sanitized_text,
-                            raw_json,
-                        )
-                        if inserted:
-                            result["new_inserted"] += 1
-                        else:
-                            result["skipped"] += 1
-                    else:
-                        # Dry run - count as would be inserted
-                        result["new_inserted"] += 1
-
-                except Exception as e:
-                    print(f"   [WARN] Error processing message {msg.id}: {e}")
-                    result["errors"] += 1
-
             # Update cursor to highest message ID
-            high_water_mark = max(msg.id for msg in messages)
             result["high_water_mark"] = high_water_mark
-
-            # Get date of last message
-            last_msg = max(messages, key=lambda m: m.date) if messages else None
-            last_message_date = last_msg.date.isoformat() if last_msg and last_msg.date else None
+            last_message_date = latest_date.isoformat() if latest_date else None
 
             print(f"   [INFO] High water mark: {high_water_mark}")
 
             if not dry_run:
-                upsert_cursor(
+                await self._db_call(
+                    upsert_cursor,
                     db_conn,
                     source_id,
                     tg_chat_id,
@@ -343,10 +386,13 @@ class MessageIngestor:
             wait_time = e.seconds
             print(f"   [WAIT] FloodWaitError: waiting {wait_time}s")
             result["error_message"] = f"FloodWaitError: {wait_time}s"
+            result["flood_wait_seconds"] = wait_time
+            result["errors"] += 1
 
             # Don't auto-wait - let user retry manually
             if not dry_run:
-                upsert_cursor(
+                await self._db_call(
+                    upsert_cursor,
                     db_conn,
                     source_id,
                     source_config.get("resolved_entity_id", 0),
@@ -355,7 +401,6 @@ class MessageIngestor:
                     status="failed",
                     error=f"FloodWaitError: {wait_time}s",
                 )
-            raise
 
         except Exception as e:
             error_msg = str(e)
@@ -364,7 +409,8 @@ class MessageIngestor:
             result["errors"] += 1
 
             if not dry_run:
-                upsert_cursor(
+                await self._db_call(
+                    upsert_cursor,
                     db_conn,
                     source_id,
                     source_config.get("resolved_entity_id", 0),
@@ -384,6 +430,7 @@ class MessageIngestor:
         dry_run: bool = False,
         force: bool = False,
         only_source: Optional[str] = None,
+        concurrency: int = 4,
     ) -> List[Dict[str, Any]]:
         """
         Ingest messages from all enabled sources.
@@ -395,49 +442,80 @@ class MessageIngestor:
             dry_run: If True, don't write to DB
             force: If True, ignore validation_status
             only_source: If set, only ingest this source
+            concurrency: Max sources ingested at once
 
         Returns:
             List of ingestion results (one per source)
         """
-        # Initialize database
+        # Initialize database on a dedicated thread that owns the connection
+        db_conn = None
         if not dry_run:
-            db_conn = init_db(db_path)
-        else:
-            db_conn = None
-
-        results = []
-
-        # Filter sources
-        if only_source:
-            sources = [s for s in sources if s["source_id"] == only_source]
-            if not sources:
-                raise ValueError(f"Source not found: {only_source}")
-
-        # Filter enabled and validated
-        if not force:
-            sources = [
-                s for s in sources
-                if s.get("enabled", True)
-                and s.get("validation_status") in ("joined", "not_applicable")
-            ]
-        else:
-            sources = [s for s in sources if s.get("enabled", True)]
-
-        print(f"\n[INFO] Ingesting from {len(sources)} source(s)")
-
-        for source in sources:
-            print(f"\n[{source.get('type', 'source').upper()}] {source.get('display_name', source['source_id'])}")
-            print(f"   Source ID: {source['source_id']}")
+            self._db_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="aijobscanner-db"
+            )
 
+        try:
             if not dry_run:
-                result = await self.ingest_source(source, db_conn, limit, dry_run)
+                db_conn = await self._db_call(init_db, db_path)
+
+            results = []
+
+            # Filter sources
+            if only_source:
+                sources = [s for s in sources if s["source_id"] == only_source]
+                if not sources:
+                    raise ValueError(f"Source not found: {only_source}")
+
+            # Filter enabled and validated
+            if not force:
+                sources = [
+                    s for s in sources
+                    if s.get("enabled", True)
+                    and s.get("validation_status") in ("joined", "not_applicable")
+                ]
             else:
-                # For dry run, create a mock connection
-                result = await self.ingest_source(source, None, limit, dry_run=True)
-
-            results.append(result)
-
-        return results
+                sources = [s for s in sources if s.get("enabled", True)]
+
+            print(f"\n[INFO] Ingesting from {len(sources)} source(s) (concurrency: {concurrency})")
+
+            # Sources are fetched concurrently; all DB access goes through the
+            # single db_conn on the DB thread, so writes stay serialized
+            sem = asyncio.Semaphore(concurrency)
+
+            async def _one(source: Dict[str, Any]) -> Dict[str, Any]:
+                async with sem:
+                    print(f"\n[{source.get('type', 'source').upper()}] {source.get('display_name', source['source_id'])}")
+                    print(f"   Source ID: {source['source_id']}")
+                    try:
+                        return await self.ingest_source(source, db_conn, limit, dry_run)
+                    except Exception as e:
+                        # ingest_source records its own failures; this covers
+                        # errors escaping it (e.g. the failed-cursor write), so
+                        # one source never costs the others their results
+                        print(f"   [FAIL] {e}")
+                        return {
+                            "source_id": source["source_id"],
+                            "display_name": source.get("display_name", "Unknown"),
+                            "source_type": source.get("type", "unknown"),
+                            "fetched": 0,
+                            "new_inserted": 0,
+                            "skipped": 0,
+                            "errors": 1,
+                            "high_water_mark": None,
+                            "error_message": str(e),
+                            "flood_wait_seconds": None,
+                        }
+
+            results.extend(await asyncio.gather(*(_one(source) for source in sources)))
+
+            return results
+
+        finally:
+            if self._db_executor is not None:
+                if db_conn is not None:
+                    await self._db_call(close_db, db_conn)
+                self._db_executor.shutdown()
+                self._db_executor = None
 
     def write_report(
         self,
@@ -456,23 +534,22 @@ class MessageIngestor:
         """
         Path(report_dir).mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One clock read for both the (local) file name and the UTC timestamp
+        now = time.time()
+        timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(now))
         report_path = os.path.join(report_dir, f"ingestion_report_{timestamp}.json")
 
         report = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "summary": {
-                "total_sources": len(results),
-                "total_fetched": sum(r.get("fetched", 0) for r in results),
-                "total_inserted": sum(r.get("new_inserted", 0) for r in results),
-                "total_skipped": sum(r.get("skipped", 0) for r in results),
-                "total_errors": sum(r.get("errors", 0) for r in results),
-                "sources_with_errors": sum(1 for r in results if r.get("errors", 0) > 0),
-            },
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)),
+            "summary": summarize_ingestion(results),
             "results": results,
         }
 
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            with open(report_path, "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
 
         return report_path
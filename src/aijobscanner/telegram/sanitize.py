@@ -0,0 +1,71 @@
+"""
+Message text sanitization for AI Job Scanner.
+
+Redacts login/verification codes before messages are stored. Kept free of
+Telethon so it can be imported cheaply on its own.
+"""
+
+import re
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+
+# Phrases followed by a 5-6 digit code that must not be stored:
+#   "login code", "Telegram code", "reset code" + whitespace + digits
+#   "code:" (including "verification code:") + optional whitespace + digits
+# Each match keeps its wording and only the digits are replaced with
+# [REDACTED]. All phrases share the literal "code", so they are fused into
+# one pattern anchored on it (the leading word is checked by lookbehind);
+# each message is scanned once and non-matching text is skipped quickly.
+_SANITIZE_RX = re.compile(
+    r"""
+    code
+    (?:
+        :\s*
+      | (?: (?<=login\ code) | (?<=telegram\ code) | (?<=reset\ code) ) \s+
+    )
+    \d{5,6}
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_CODE_DIGITS = re.compile(r'\d{5,6}')
+
+# Shared, read-only results so the common paths allocate nothing per call
+_NO_FLAGS: Mapping[str, bool] = MappingProxyType({"sanitized": False})
+_SANITIZED_FLAGS: Mapping[str, bool] = MappingProxyType({"sanitized": True})
+_EMPTY_RESULT: Tuple[str, Mapping[str, bool]] = ("", MappingProxyType({}))
+
+
+def _redact_match(match: "re.Match[str]") -> str:
+    """Keep the matched wording but redact its digits."""
+    return _CODE_DIGITS.sub('[REDACTED]', match.group(0))
+
+
+def sanitize_text(text: str) -> Tuple[str, Mapping[str, bool]]:
+    """
+    Sanitize message text to avoid persisting sensitive data.
+
+    Redacts patterns that look like:
+    - Login codes (5-6 digits)
+    - Telegram verification codes
+    - Password reset codes
+    - Verification codes
+
+    Args:
+        text: Original message text
+
+    Returns:
+        Tuple of (sanitized_text, flags); flags is a shared read-only mapping
+    """
+    if not text:
+        return _EMPTY_RESULT
+
+    # Every pattern contains the word "code"; most job posts don't, and a
+    # substring check is far cheaper than running the regex engine
+    if "code" not in text.lower():
+        return text, _NO_FLAGS
+
+    sanitized, count = _SANITIZE_RX.subn(_redact_match, text)
+
+    return sanitized, _SANITIZED_FLAGS if count else _NO_FLAGS
@@ -5,15 +5,48 @@ Uses Telethon to validate access to Telegram groups and channels.
 """
 
 import os
+import re
 import asyncio
 import json
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Any, Optional
 from telethon import TelegramClient, errors
 from telethon.tl.functions.channels import JoinChannelRequest
-from telethon.tl.functions.messages import ImportChatInviteRequest
-from telethon.tl.types import Channel, Chat
+from telethon.tl.functions.messages import CheckChatInviteRequest, ImportChatInviteRequest
+from telethon.tl.types import Channel, Chat, ChatInviteAlready
+
+# orjson is optional; it writes the report noticeably faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Invite hash in https://t.me/+HASH, https://t.me/+/HASH or .../joinchat/HASH,
+# ignoring any trailing slash or query string
+_INVITE_RE = re.compile(r'(?:t\.me/\+/?|joinchat/)([A-Za-z0-9_-]+)')
+
+# Telethon already sleeps through flood waits up to flood_sleep_threshold
+# (60s); longer waits up to this many seconds are slept and retried once
+FLOOD_WAIT_RETRY_MAX = 120
+
+
+@dataclass(slots=True)
+class ValidationResult:
+    """Outcome of validating access to one Telegram source."""
+    source_id: str
+    display_name: Optional[str]
+    source_type: Optional[str]
+    last_validated_at: str
+    validation_status: str = "join_failed"
+    last_error: Optional[str] = None
+    resolved_entity_id: Optional[int] = None
+    resolved_entity_type: Optional[str] = None
+    messages_readable: bool = False
+    message_count: int = 0
 
 
 class SourceValidator:
@@ -33,6 +66,7 @@ class SourceValidator:
         phone: str,
         session_dir: str,
         two_fa_password: Optional[str] = None,
+        client: Optional[TelegramClient] = None,
     ):
         """
         Initialize the validator.
@@ -43,6 +77,8 @@ class SourceValidator:
             phone: Phone number for the monitoring account
             session_dir: Directory to store session files
             two_fa_password: Optional 2FA password for the account
+            client: Optional externally managed TelegramClient to reuse; the
+                validator then never disconnects it
         """
         self.api_id = api_id
         self.api_hash = api_hash
@@ -57,7 +93,8 @@ class SourceValidator:
         session_name = phone.replace("+", "").replace(" ", "_")
         session_file = str(session_path / session_name)
 
-        self.client = TelegramClient(
+        self._owns_client = client is None
+        self.client = client if client is not None else TelegramClient(
             session_file,
             api_id,
             api_hash,
@@ -65,6 +102,11 @@ class SourceValidator:
 
         self.session_dir = session_dir
 
+        # Joined groups keyed by entity id and casefolded title, built from
+        # iter_dialogs at most once per connection (see _find_joined_group)
+        self._dialog_index: Optional[Dict[Any, Any]] = None
+        self._dialog_lock = asyncio.Lock()
+
     async def connect(self) -> None:
         """
         Connect to Telegram and authenticate.
@@ -72,11 +114,15 @@ class SourceValidator:
         On first run, will request SMS code and 2FA password (if enabled).
         On subsequent runs, will use saved session.
         """
+        self._dialog_index = None
+
         # Check if this is first run (no session file)
         session_file = Path(self.client.session.filename)
         is_first_run = not session_file.exists()
 
-        await self.client.connect()
+        # A shared client may already be connected
+        if not self.client.is_connected():
+            await self.client.connect()
 
         if not await self.client.is_user_authorized():
             # First run - need to authenticate
@@ -125,8 +171,44 @@ class SourceValidator:
             print(f"[OK] Using existing session: {session_file}")
 
     async def disconnect(self) -> None:
-        """Disconnect from Telegram."""
-        await self.client.disconnect()
+        """Disconnect from Telegram (unless the client is externally managed)."""
+        if self._owns_client:
+            await self.client.disconnect()
+
+    @classmethod
+    @asynccontextmanager
+    async def shared(
+        cls,
+        api_id: int,
+        api_hash: str,
+        phone: str,
+        session_dir: str,
+        two_fa_password: Optional[str] = None,
+    ) -> AsyncIterator["SourceValidator"]:
+        """
+        Connected validator whose session stays open for the whole block.
+
+        Usage:
+            async with SourceValidator.shared(api_id, api_hash, phone, session_dir) as v:
+                await v.validate_all(sources)
+                await v.validate_all(more_sources)  # same connection
+
+        Args:
+            api_id: Telegram API ID from my.telegram.org
+            api_hash: Telegram API hash from my.telegram.org
+            phone: Phone number for the monitoring account
+            session_dir: Directory to store session files
+            two_fa_password: Optional 2FA password for the account
+
+        Yields:
+            Connected SourceValidator, disconnected when the block exits
+        """
+        validator = cls(api_id, api_hash, phone, session_dir, two_fa_password)
+        try:
+            await validator.connect()
+            yield validator
+        finally:
+            await validator.disconnect()
 
     def _extract_invite_hash(self, invite_link: str) -> str:
         """
@@ -138,53 +220,84 @@ class SourceValidator:
         Returns:
             Just the hash portion (e.g., ABC123...)
         """
-        # Handle various invite link formats
-        # https://t.me/+HASH or https://t.me/joinchat/HASH
-        if "+/" in invite_link:
-            # https://t.me/+HASH/ format (with slash)
-            return invite_link.split("+/")[-1]
-        elif "t.me/+" in invite_link:
-            # https://t.me/+HASH format (no slash after +)
-            return invite_link.split("+")[-1]
-        elif "joinchat/" in invite_link:
-            # https://t.me/joinchat/HASH format
-            return invite_link.split("joinchat/")[-1]
-        else:
-            # Assume it's already a hash
-            return invite_link
+        match = _INVITE_RE.search(invite_link)
+        # Assume it's already a hash if it isn't a recognised link
+        return match.group(1) if match else invite_link
+
+    async def _find_joined_group(
+        self,
+        invite_hash: str,
+        source: Dict[str, Any],
+    ) -> Optional[Any]:
+        """
+        Find the entity of a group the account already belongs to.
+
+        Asks Telegram which chat the invite points to; if that fails, looks
+        the group up by resolved_entity_id or display_name in the dialogs.
+
+        Args:
+            invite_hash: Invite hash from the source's invite link
+            source: Source dictionary from telegram_sources.yaml
+
+        Returns:
+            The group entity, or None if it could not be found
+        """
+        try:
+            invite = await self.client(CheckChatInviteRequest(invite_hash))
+            if isinstance(invite, ChatInviteAlready):
+                return invite.chat
+        except errors.RPCError:
+            pass
+
+        async with self._dialog_lock:
+            if self._dialog_index is None:
+                index = {}
+                async for dialog in self.client.iter_dialogs():
+                    if dialog.is_group:
+                        index[dialog.entity.id] = dialog.entity
+                        index.setdefault((dialog.name or "").casefold(), dialog.entity)
+                self._dialog_index = index
+
+        for key in (source.get("resolved_entity_id"), (source.get("display_name") or "").casefold()):
+            if key and key in self._dialog_index:
+                return self._dialog_index[key]
+
+        return None
 
     async def validate_source(
         self,
         source: Dict[str, Any],
-        message_limit: int = 5,
-    ) -> Dict[str, Any]:
+        message_limit: int = 1,
+        retry_flood_wait: bool = True,
+        validated_at: Optional[str] = None,
+    ) -> ValidationResult:
         """
         Validate access to a single Telegram source.
 
         Args:
             source: Source dictionary from telegram_sources.yaml
             message_limit: Number of messages to fetch to verify readability
+            retry_flood_wait: Wait out and retry once on a FloodWaitError of
+                at most FLOOD_WAIT_RETRY_MAX seconds
+            validated_at: ISO timestamp to record as last_validated_at
+                (defaults to now); batches pass their shared run start time
 
         Returns:
-            Result dictionary with validation status and metadata
+            ValidationResult with validation status and metadata
         """
         source_id = source.get("source_id")
         source_type = source.get("type")
         invite_link = source.get("invite_link")
         public_handle = source.get("public_handle")
 
-        result = {
-            "source_id": source_id,
-            "display_name": source.get("display_name"),
-            "source_type": source_type,
-            "validation_status": "join_failed",
-            "last_validated_at": datetime.now(timezone.utc).isoformat(),
-            "last_error": None,
-            "resolved_entity_id": None,
-            "resolved_entity_type": None,
-            "messages_readable": False,
-            "message_count": 0,
-        }
+        result = ValidationResult(
+            source_id=source_id,
+            display_name=source.get("display_name"),
+            source_type=source_type,
+            last_validated_at=validated_at or datetime.now(timezone.utc).isoformat(),
+        )
+        # Set only by the branch that resolved the source; never re-fetched by ID
+        entity = None
 
         try:
             # Groups: Join via invite link
@@ -199,44 +312,41 @@ class SourceValidator:
                     # Attempt to join the group
                     chat = await self.client(ImportChatInviteRequest(invite_hash))
 
-                    result["resolved_entity_id"] = chat.id
-                    result["resolved_entity_type"] = "group"
-                    result["validation_status"] = "joined"
+                    result.resolved_entity_id = chat.id
+                    result.resolved_entity_type = "group"
+                    result.validation_status = "joined"
                     entity = chat
 
                     print(f"   [OK] Successfully joined group")
 
                 except errors.InviteHashInvalidError:
-                    result["last_error"] = "Invalid invite hash"
+                    result.last_error = "Invalid invite hash"
                     print(f"   [FAIL] Invalid invite hash")
                     return result
 
                 except errors.InviteHashExpiredError:
-                    result["last_error"] = "Invite link expired"
+                    result.last_error = "Invite link expired"
                     print(f"   [FAIL] Invite link expired")
                     return result
 
                 except errors.UserAlreadyParticipantError:
                     # Already joined - need to get the chat entity
-                    result["validation_status"] = "joined"
+                    result.validation_status = "joined"
                     print(f"   [OK] Already a member - attempting to get chat entity")
 
-                    # Try to get the chat by iterating through dialogs
-                    # This is a workaround for groups where we're already members
                     try:
-                        async for dialog in self.client.iter_dialogs():
-                            if dialog.is_group:
-                                # Check if this is the group we're looking for
-                                # For now, we'll skip message verification for already-joined groups
-                                result["resolved_entity_id"] = dialog.entity.id
-                                result["resolved_entity_type"] = "group"
-                                entity = dialog.entity
-                                print(f"   [OK] Found group in dialogs: {dialog.name}")
-                                break
+                        entity = await self._find_joined_group(invite_hash, source)
                     except Exception as e:
                         print(f"   [WARN] Could not get group entity: {e}")
                         entity = None
 
+                    if entity is not None:
+                        result.resolved_entity_id = entity.id
+                        result.resolved_entity_type = "group"
+                        print(f"   [OK] Found group: {getattr(entity, 'title', entity.id)}")
+                    else:
+                        print(f"   [WARN] Group not found among joined chats")
+
             # Channels: Subscribe via public handle
             elif public_handle:
                 print(f"\n[CHANNEL] Validating: {source.get('display_name')} ({source_id})")
@@ -245,8 +355,8 @@ class SourceValidator:
                 try:
                     # Resolve the channel entity
                     entity = await self.client.get_entity(public_handle)
-                    result["resolved_entity_id"] = entity.id
-                    result["resolved_entity_type"] = "channel"
+                    result.resolved_entity_id = entity.id
+                    result.resolved_entity_type = "channel"
 
                     # Check if we need to join
                     if hasattr(entity, "left") and entity.left:
@@ -256,30 +366,26 @@ class SourceValidator:
                     else:
                         print(f"   [OK] Already subscribed")
 
-                    result["validation_status"] = "joined"
+                    result.validation_status = "joined"
 
                 except errors.ChannelPrivateError:
-                    result["last_error"] = "Channel is private"
+                    result.last_error = "Channel is private"
                     print(f"   [FAIL] Channel is private")
                     return result
 
                 except errors.UsernameNotOccupiedError:
-                    result["last_error"] = "Username not found"
+                    result.last_error = "Username not found"
                     print(f"   [FAIL] Username not found")
                     return result
 
             else:
-                result["last_error"] = "No invite_link or public_handle found"
+                result.last_error = "No invite_link or public_handle found"
                 print(f"   [FAIL] No valid access method found")
                 return result
 
             # Verify we can read messages
-            if entity:
-                target_entity = entity
-            elif result["resolved_entity_id"]:
-                target_entity = await self.client.get_entity(result["resolved_entity_id"])
-            else:
-                result["last_error"] = "Failed to resolve entity"
+            if entity is None:
+                result.last_error = "Failed to resolve entity"
                 return result
 
             # Try to fetch messages
@@ -287,98 +393,173 @@ class SourceValidator:
 
             try:
                 messages = await self.client.get_messages(
-                    target_entity,
+                    entity,
                     limit=message_limit,
                 )
 
                 if messages is not None:
                     message_count = len(messages) if messages else 0
-                    result["messages_readable"] = True
-                    result["message_count"] = message_count
+                    result.messages_readable = True
+                    result.message_count = message_count
                     print(f"   [OK] Successfully read {message_count} messages")
                 else:
-                    result["validation_status"] = "blocked"
-                    result["last_error"] = "Cannot fetch messages"
+                    result.validation_status = "blocked"
+                    result.last_error = "Cannot fetch messages"
                     print(f"   [FAIL] Cannot fetch messages (blocked)")
 
             except errors.ChatForbiddenError:
-                result["validation_status"] = "blocked"
-                result["last_error"] = "Chat forbidden"
+                result.validation_status = "blocked"
+                result.last_error = "Chat forbidden"
                 print(f"   [FAIL] Chat forbidden")
 
             except Exception as e:
-                result["validation_status"] = "blocked"
-                result["last_error"] = f"Error fetching messages: {str(e)}"
+                result.validation_status = "blocked"
+                result.last_error = f"Error fetching messages: {str(e)}"
                 print(f"   [FAIL] Error fetching messages: {e}")
 
         except errors.FloodWaitError as e:
             # Rate limited
             wait_time = e.seconds
-            result["validation_status"] = "join_failed"
-            result["last_error"] = f"Rate limited. Wait {wait_time} seconds"
+            if retry_flood_wait and wait_time <= FLOOD_WAIT_RETRY_MAX:
+                print(f"   [RATE LIMIT] Waiting {wait_time} seconds, then retrying")
+                await asyncio.sleep(wait_time)
+                return await self.validate_source(
+                    source, message_limit, retry_flood_wait=False, validated_at=validated_at
+                )
+
+            result.validation_status = "join_failed"
+            result.last_error = f"Rate limited. Wait {wait_time} seconds"
             print(f"   [RATE LIMIT] Wait {wait_time} seconds before retrying")
 
         except Exception as e:
-            result["last_error"] = f"Unexpected error: {str(e)}"
+            result.last_error = f"Unexpected error: {str(e)}"
             print(f"   [ERROR] Unexpected error: {e}")
 
         return result
 
-    async def validate_all(
+    def _select_sources(
         self,
         sources: List[Dict[str, Any]],
-        only_id: Optional[str] = None,
-        message_limit: int = 5,
+        only_id: Optional[str],
     ) -> List[Dict[str, Any]]:
+        """Apply the only_id filter, reporting when nothing matches."""
+        if only_id:
+            sources = [s for s in sources if s.get("source_id") == only_id]
+            if not sources:
+                print(f"[ERROR] No source found with ID: {only_id}")
+
+        return sources
+
+    def _start_validations(
+        self,
+        sources: List[Dict[str, Any]],
+        message_limit: int,
+        concurrency: int,
+    ) -> List["asyncio.Task[ValidationResult]"]:
+        """
+        Schedule one validation task per source, at most `concurrency` at a time.
+
+        Rate limits are handled by Telethon's flood sleep and the FloodWait
+        retry in validate_source, so a slot is reused as soon as it is free.
+        """
+        print(f"\n[INFO] Starting validation of {len(sources)} source(s) (concurrency: {concurrency})")
+
+        sem = asyncio.Semaphore(concurrency)
+        # Every result in the batch shares the run's start time
+        run_started_at = datetime.now(timezone.utc).isoformat()
+
+        async def _one(idx: int, source: Dict[str, Any]) -> ValidationResult:
+            async with sem:
+                print(f"\n{'='*60}")
+                print(f"Source {idx}/{len(sources)}")
+                print(f"{'='*60}")
+                return await self.validate_source(
+                    source, message_limit, validated_at=run_started_at
+                )
+
+        return [
+            asyncio.create_task(_one(idx, source))
+            for idx, source in enumerate(sources, 1)
+        ]
+
+    async def validate_iter(
+        self,
+        sources: List[Dict[str, Any]],
+        only_id: Optional[str] = None,
+        message_limit: int = 1,
+        concurrency: int = 4,
+    ) -> AsyncIterator[ValidationResult]:
         """
-        Validate multiple sources.
+        Validate multiple sources concurrently, yielding results as they complete.
 
         Args:
             sources: List of source dictionaries
             only_id: If set, only validate this specific source_id
             message_limit: Number of messages to fetch to verify readability
+            concurrency: Maximum number of sources validated at once
 
-        Returns:
-            List of validation result dictionaries
+        Yields:
+            ValidationResult objects in completion order
         """
-        # Filter to specific source if requested
-        if only_id:
-            sources = [s for s in sources if s.get("source_id") == only_id]
-            if not sources:
-                print(f"[ERROR] No source found with ID: {only_id}")
-                return []
+        sources = self._select_sources(sources, only_id)
+        if not sources:
+            return
 
-        print(f"\n[INFO] Starting validation of {len(sources)} source(s)")
+        tasks = self._start_validations(sources, message_limit, concurrency)
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early (error or Ctrl+C): drop outstanding work
+            for task in tasks:
+                task.cancel()
 
-        results = []
+    async def validate_all(
+        self,
+        sources: List[Dict[str, Any]],
+        only_id: Optional[str] = None,
+        message_limit: int = 1,
+        concurrency: int = 4,
+    ) -> List[ValidationResult]:
+        """
+        Validate multiple sources concurrently.
 
-        for idx, source in enumerate(sources, 1):
-            print(f"\n{'='*60}")
-            print(f"Source {idx}/{len(sources)}")
-            print(f"{'='*60}")
+        Args:
+            sources: List of source dictionaries
+            only_id: If set, only validate this specific source_id
+            message_limit: Number of messages to fetch to verify readability
+            concurrency: Maximum number of sources validated at once
 
-            result = await self.validate_source(source, message_limit)
-            results.append(result)
+        Returns:
+            List of ValidationResult objects, in source order
+        """
+        sources = self._select_sources(sources, only_id)
+        if not sources:
+            return []
 
-            # Add a small delay between validations to avoid rate limits
-            if idx < len(sources):
-                delay = 2
-                print(f"\n[WAIT] Waiting {delay} seconds before next validation...")
-                await asyncio.sleep(delay)
+        tasks = self._start_validations(sources, message_limit, concurrency)
 
-        return results
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
 
+    @staticmethod
     def write_report(
-        self,
-        results: List[Dict[str, Any]],
+        results: List[ValidationResult],
         report_dir: str,
+        status_counts: Optional[Counter] = None,
     ) -> str:
         """
         Write validation results to JSON report file.
 
         Args:
-            results: List of validation result dictionaries
+            results: List of ValidationResult objects
             report_dir: Directory to write report to
+            status_counts: validation_status tallies kept while the results
+                were collected; counted from results if not given
 
         Returns:
             Path to the created report file
@@ -386,29 +567,35 @@ class SourceValidator:
         report_path = Path(report_dir)
         report_path.mkdir(parents=True, exist_ok=True)
 
-        # Generate timestamped filename
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        # Generate timestamped filename (same instant as the report body)
+        now = datetime.now(timezone.utc)
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         filename = f"source_validation_{timestamp}.json"
         filepath = report_path / filename
 
-        # Calculate summary statistics
-        total = len(results)
-        joined = sum(1 for r in results if r["validation_status"] == "joined")
-        failed = sum(1 for r in results if r["validation_status"] == "join_failed")
-        blocked = sum(1 for r in results if r["validation_status"] == "blocked")
+        # Calculate summary statistics in one pass, unless already tallied
+        statuses = status_counts if status_counts is not None else Counter(
+            r.validation_status for r in results
+        )
 
         report = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now.isoformat(),
             "summary": {
-                "total_sources": total,
-                "joined": joined,
-                "failed": failed,
-                "blocked": blocked,
+                "total_sources": len(results),
+                "joined": statuses["joined"],
+                "failed": statuses["join_failed"],
+                "blocked": statuses["blocked"],
             },
             "results": results,
         }
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        # orjson serializes dataclasses natively; stdlib json needs dicts
+        if orjson is not None:
+            with open(filepath, "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        else:
+            report["results"] = [asdict(r) for r in results]
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
 
         return str(filepath)
@@ -8,29 +8,53 @@ Handles persistent storage including:
 """
 
 from .sqlite import (
+    MessageRow,
     init_db,
+    close_db,
+    open_readonly,
+    compact_db,
     get_cursor,
     upsert_cursor,
     insert_message_if_new,
+    insert_messages_batch,
     get_high_water_marks,
     get_message_stats,
+    get_combined_stats,
     fetch_pending_messages,
+    fetch_pending_messages_list,
+    iter_pending_batches,
     upsert_message_classification,
     mark_message_classified,
+    save_classifications_batch,
+    rebuild_audit_table_from_log,
+    WriteTransaction,
+    writer_transaction,
     get_classification_statistics,
     fetch_ai_relevant_messages,
 )
 
 __all__ = [
+    "MessageRow",
     "init_db",
+    "close_db",
+    "open_readonly",
+    "compact_db",
     "get_cursor",
     "upsert_cursor",
     "insert_message_if_new",
+    "insert_messages_batch",
     "get_high_water_marks",
     "get_message_stats",
+    "get_combined_stats",
     "fetch_pending_messages",
+    "fetch_pending_messages_list",
+    "iter_pending_batches",
     "upsert_message_classification",
     "mark_message_classified",
+    "save_classifications_batch",
+    "rebuild_audit_table_from_log",
+    "WriteTransaction",
+    "writer_transaction",
     "get_classification_statistics",
     "fetch_ai_relevant_messages",
 ]
@@ -10,8 +10,162 @@ Provides:
 
 import sqlite3
 import json
-from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple, Iterator
+
+# orjson is optional; it serializes the per-classification JSON columns
+# several times faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class MessageRow(NamedTuple):
+    """One message ready for insert_messages_batch, in INSERT column order."""
+    source_id: str
+    tg_chat_id: int
+    tg_message_id: int
+    date: Optional[str]
+    sender_id: Optional[int]
+    text: str
+    permalink: Optional[str]
+    raw_text: str
+
+
+def _utc_now() -> str:
+    """
+    Current UTC time as a naive ISO-8601 string.
+
+    Uses the timezone-aware clock (datetime.utcnow() is deprecated) but
+    keeps the offset-free format already stored in existing databases.
+    Batch writers call this once per batch and share the value.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize obj to compact JSON text (UTF-8, non-ASCII kept as-is)."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _json_line(obj: Any) -> bytes:
+    """Serialize obj as one UTF-8 JSON Lines record (trailing newline)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return _json_dumps(obj).encode("utf-8") + b"\n"
+
+
+# Hot-path statements as module constants: each is prepared once per
+# connection and then served from the sqlite3 statement cache
+_SQL_GET_CURSOR = """
+    SELECT source_id, tg_chat_id, last_message_id, last_message_date,
+           last_run_at, last_status, last_error
+    FROM ingestion_cursors
+    WHERE source_id = ?
+"""
+
+_SQL_UPSERT_CURSOR = """
+    INSERT INTO ingestion_cursors
+        (source_id, tg_chat_id, last_message_id, last_message_date, last_run_at, last_status, last_error)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (source_id) DO UPDATE SET
+        tg_chat_id = excluded.tg_chat_id,
+        last_message_id = excluded.last_message_id,
+        last_message_date = excluded.last_message_date,
+        last_run_at = excluded.last_run_at,
+        last_status = excluded.last_status,
+        last_error = excluded.last_error
+    RETURNING source_id, tg_chat_id, last_message_id, last_message_date,
+              last_run_at, last_status, last_error
+"""
+
+# date_unix (the sort key) is derived from the ISO date (?4) by SQLite
+_SQL_INSERT_MESSAGE = """
+    INSERT OR IGNORE INTO telegram_messages
+        (source_id, tg_chat_id, tg_message_id, date, date_unix, sender_id, text, permalink, raw_json, ingested_at, processed_status)
+    VALUES (?1, ?2, ?3, ?4, CAST(strftime('%s', ?4) AS INTEGER), ?5, ?6, ?7, ?8, ?9, 'pending')
+"""
+
+# raw_json is assembled by SQLite from the bound fields plus the raw text (?8)
+_SQL_INSERT_MESSAGES_BATCH = """
+    INSERT OR IGNORE INTO telegram_messages
+        (source_id, tg_chat_id, tg_message_id, date, date_unix, sender_id, text, permalink, raw_json, ingested_at, processed_status)
+    VALUES (?1, ?2, ?3, ?4, CAST(strftime('%s', ?4) AS INTEGER), ?5, ?6, ?7,
+            json_object('id', ?3, 'date', ?4, 'message', ?8, 'sender_id', ?5),
+            ?9, 'pending')
+"""
+
+# Pending-message SELECTs keyed by (reprocess, filtered by source_id)
+_SQL_PENDING_COLUMNS = """
+    SELECT id, source_id, tg_chat_id, tg_message_id, date, text, permalink
+    FROM telegram_messages
+"""
+_SQL_PENDING_ALL = _SQL_PENDING_COLUMNS + """
+    WHERE processed_status = 'pending'
+    ORDER BY date_unix DESC LIMIT ?
+"""
+_SQL_PENDING_SRC = _SQL_PENDING_COLUMNS + """
+    WHERE processed_status = 'pending' AND source_id = ?
+    ORDER BY date_unix DESC LIMIT ?
+"""
+_SQL_REPROCESS_ALL = _SQL_PENDING_COLUMNS + """
+    ORDER BY date_unix DESC LIMIT ?
+"""
+_SQL_REPROCESS_SRC = _SQL_PENDING_COLUMNS + """
+    WHERE source_id = ?
+    ORDER BY date_unix DESC LIMIT ?
+"""
+_SQL_PENDING = {
+    (False, False): _SQL_PENDING_ALL,
+    (False, True): _SQL_PENDING_SRC,
+    (True, False): _SQL_REPROCESS_ALL,
+    (True, True): _SQL_REPROCESS_SRC,
+}
+
+_SQL_GET_HIGH_WATER_MARKS = "SELECT source_id, last_message_id FROM ingestion_cursors"
+
+_SQL_UPSERT_CLASSIFICATION = """
+    INSERT INTO message_classifications
+        (source_id, tg_message_id, tg_chat_id, classifier_version,
+         is_ai_relevant, score, reasons_json, classification_metadata, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (source_id, tg_message_id, classifier_version) DO UPDATE SET
+        is_ai_relevant = excluded.is_ai_relevant,
+        score = excluded.score,
+        reasons_json = excluded.reasons_json,
+        classification_metadata = excluded.classification_metadata,
+        created_at = excluded.created_at
+"""
+
+_SQL_MARK_CLASSIFIED = """
+    UPDATE telegram_messages
+    SET processed_status = 'classified',
+        is_ai_relevant = ?,
+        ai_relevance_score = ?,
+        classified_at = ?
+    WHERE source_id = ? AND tg_message_id = ?
+"""
+
+_SQL_COMBINED_STATS = """
+    SELECT
+        COUNT(*) as total_messages,
+        COUNT(*) FILTER (WHERE processed_status = 'pending') as pending_count,
+        COUNT(*) FILTER (WHERE processed_status = 'classified') as classified_count,
+        COUNT(*) FILTER (WHERE is_ai_relevant = 1) as ai_relevant_count,
+        COUNT(*) FILTER (WHERE is_ai_relevant = 0) as not_relevant_count,
+        AVG(ai_relevance_score) as avg_score,
+        (SELECT COUNT(DISTINCT source_id) FROM telegram_messages) as sources_count
+    FROM telegram_messages
+"""
+
+
+# Bumped whenever _migrate gains a step; stored in PRAGMA user_version
+SCHEMA_VERSION = 3
 
 
 def init_db(db_path: str) -> sqlite3.Connection:
@@ -29,9 +183,72 @@ def init_db(db_path: str) -> sqlite3.Connection:
     Returns:
         sqlite3.Connection: Database connection
     """
-    conn = sqlite3.connect(db_path)
+    # Autocommit mode: single statements commit on their own and multi-row
+    # writers open their transactions explicitly with BEGIN IMMEDIATE, so a
+    # write never has to upgrade a DEFERRED read lock (and hit SQLITE_BUSY)
+    conn = sqlite3.connect(db_path, cached_statements=256, isolation_level=None)
+    # Lets compact_db hand free pages back to the filesystem. Only takes
+    # effect while the file has no tables yet, i.e. for new databases.
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL lets readers run alongside the ingest writer; NORMAL only syncs at
+    # checkpoints, which is still corruption-safe in WAL mode. In-memory
+    # databases have no journal file to switch.
+    if db_path != ":memory:":
+        conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    _apply_read_pragmas(conn)
+    # Checkpoint the WAL every 1000 pages
+    conn.execute("PRAGMA wal_autocheckpoint = 1000")
+
+    # Schema setup only runs when the stored user_version is behind
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _migrate(conn)
+
+    # Give the planner statistics for the indexes once there is data
+    # (ANALYZE records nothing for an empty table, so this is cheap until then)
+    try:
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_stat1 WHERE tbl = 'telegram_messages' LIMIT 1"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        has_stats = None  # sqlite_stat1 doesn't exist yet
+    if not has_stats:
+        conn.execute("ANALYZE")
+
+    return conn
+
 
+def _migrate(conn: sqlite3.Connection) -> None:
+    """
+    Bring the schema up to SCHEMA_VERSION in a single transaction.
+
+    Each step is keyed on the user_version it upgrades from; add a new
+    "if version < N" step (and bump SCHEMA_VERSION) for every schema change.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the write lock: another process may have migrated
+        # between our check and BEGIN
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            _create_schema_v1(conn)
+        if version < 2:
+            _add_date_unix_v2(conn, from_v1=version == 1)
+        if version < 3:
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_msgs_src_status_date
+                ON telegram_messages(source_id, processed_status, date_unix DESC)
+            """)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _create_schema_v1(conn: sqlite3.Connection) -> None:
+    """Create tables and indexes, upgrading databases made before user_version."""
     # Create ingestion_cursors table (SSoT)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS ingestion_cursors (
@@ -45,10 +262,13 @@ def init_db(db_path: str) -> sqlite3.Connection:
         )
     """)
 
-    # Create telegram_messages table with idempotency
+    # Create telegram_messages table with idempotency. Here and in
+    # message_classifications, id is a plain rowid alias: AUTOINCREMENT
+    # would add a sqlite_sequence write per insert. Databases created with
+    # AUTOINCREMENT keep it.
     conn.execute("""
         CREATE TABLE IF NOT EXISTS telegram_messages (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             source_id TEXT NOT NULL,
             tg_chat_id INTEGER NOT NULL,
             tg_message_id INTEGER NOT NULL,
@@ -66,21 +286,16 @@ def init_db(db_path: str) -> sqlite3.Connection:
         )
     """)
 
-    # Add new columns if they don't exist (for existing databases)
-    try:
-        conn.execute("ALTER TABLE telegram_messages ADD COLUMN ai_relevance_score REAL")
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-
-    try:
-        conn.execute("ALTER TABLE telegram_messages ADD COLUMN classified_at TEXT")
-    except sqlite3.OperationalError:
-        pass  # Column already exists
+    # Databases created before the classifier lack its columns
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(telegram_messages)")}
+    for name, decl in (("ai_relevance_score", "REAL"), ("classified_at", "TEXT")):
+        if name not in columns:
+            conn.execute(f"ALTER TABLE telegram_messages ADD COLUMN {name} {decl}")
 
     # Create message_classifications table (audit trail)
     conn.execute("""
         CREATE TABLE IF NOT EXISTS message_classifications (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            id INTEGER PRIMARY KEY,
             source_id TEXT NOT NULL,
             tg_message_id INTEGER NOT NULL,
             tg_chat_id INTEGER NOT NULL,
@@ -94,10 +309,128 @@ def init_db(db_path: str) -> sqlite3.Connection:
         )
     """)
 
-    conn.commit()
+    # (source_id, tg_message_id) is already covered by the UNIQUE
+    # constraint's index; the date-ordered indexes are created by v2 on
+    # date_unix.
+    # Covering index: get_combined_stats aggregates from it without
+    # touching the (much wider) table rows
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_msgs_stats
+        ON telegram_messages(processed_status, is_ai_relevant, ai_relevance_score)
+    """)
+
+
+def _add_date_unix_v2(conn: sqlite3.Connection, from_v1: bool) -> None:
+    """
+    Add the INTEGER date_unix sort key and the date-ordered indexes on it.
+
+    Args:
+        conn: Database connection inside the migration transaction
+        from_v1: True when upgrading a version 1 database, whose indexes of
+            the same names are keyed on the ISO date text and get rebuilt
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(telegram_messages)")}
+    if "date_unix" not in columns:
+        conn.execute("ALTER TABLE telegram_messages ADD COLUMN date_unix INTEGER")
+    conn.execute("""
+        UPDATE telegram_messages
+        SET date_unix = CAST(strftime('%s', date) AS INTEGER)
+        WHERE date_unix IS NULL AND date IS NOT NULL
+    """)
+
+    if from_v1:
+        for name in ("idx_msgs_pending", "idx_msgs_ai_ranked", "idx_msgs_source_date"):
+            conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # Partial indexes in the ORDER BY of the pending and AI-relevant fetches,
+    # so a LIMITed read walks the index instead of sorting the table
+    conn.execute("""
+        CREATE INDEX idx_msgs_pending
+        ON telegram_messages(date_unix DESC) WHERE processed_status = 'pending'
+    """)
+    conn.execute("""
+        CREATE INDEX idx_msgs_ai_ranked
+        ON telegram_messages(ai_relevance_score DESC, date_unix DESC)
+        WHERE is_ai_relevant = 1
+    """)
+    conn.execute("""
+        CREATE INDEX idx_msgs_source_date
+        ON telegram_messages(source_id, date_unix DESC)
+    """)
+
+
+def _apply_read_pragmas(conn: sqlite3.Connection) -> None:
+    """Per-connection tuning shared by the writer and read-only connections."""
+    # Temp tables in RAM, 64 MiB page cache and up to 256 MiB of
+    # memory-mapped reads; wait up to 5s for a lock held by another process
+    # (e.g. classify running during ingest)
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA mmap_size = 268435456")
+    conn.execute("PRAGMA busy_timeout = 5000")
+
+
+def open_readonly(db_path: str) -> sqlite3.Connection:
+    """
+    Open a read-only connection to an existing database.
+
+    Under WAL a reader never blocks on (or blocks) the single writer from
+    init_db, so reporting and export can run while ingest or classify is
+    writing. Writes through this connection raise sqlite3.OperationalError.
+
+    Args:
+        db_path: Path to a SQLite database created by init_db
+
+    Returns:
+        sqlite3.Connection: Read-only database connection
+    """
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, cached_statements=256)
+    _apply_read_pragmas(conn)
     return conn
 
 
+def close_db(conn: sqlite3.Connection) -> None:
+    """
+    Close a connection opened by init_db.
+
+    Runs PRAGMA optimize first so SQLite can refresh query planner statistics
+    for tables whose contents changed during the session.
+
+    Args:
+        conn: Database connection
+    """
+    try:
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+    conn.close()
+
+
+def compact_db(conn: sqlite3.Connection, pages: int = 1000) -> int:
+    """
+    Reclaim free pages and truncate the WAL; meant for maintenance jobs.
+
+    Frees up to `pages` pages with PRAGMA incremental_vacuum (a no-op for
+    databases created before auto_vacuum=INCREMENTAL was set), then runs a
+    TRUNCATE checkpoint to cap WAL growth. Call outside a transaction.
+
+    Args:
+        conn: Database connection from init_db
+        pages: Maximum number of free pages to release
+
+    Returns:
+        int: Number of pages released
+    """
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    # incremental_vacuum frees one page per step; execute() would only step
+    # it once, executescript() runs it to completion
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+    after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return before - after
+
+
 def get_cursor(conn: sqlite3.Connection, source_id: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve current cursor for a source.
@@ -109,17 +442,17 @@ def get_cursor(conn: sqlite3.Connection, source_id: str) -> Optional[Dict[str, A
     Returns:
         Dict with cursor fields or None if not found
     """
-    cursor = conn.execute(
-        "SELECT source_id, tg_chat_id, last_message_id, last_message_date, "
-        "last_run_at, last_status, last_error FROM ingestion_cursors "
-        "WHERE source_id = ?",
-        (source_id,)
-    )
+    cursor = conn.execute(_SQL_GET_CURSOR, (source_id,))
     row = cursor.fetchone()
 
     if row is None:
         return None
 
+    return _cursor_row_to_dict(row)
+
+
+def _cursor_row_to_dict(row: Tuple) -> Dict[str, Any]:
+    """Convert an ingestion_cursors row to a dictionary."""
     return {
         "source_id": row[0],
         "tg_chat_id": row[1],
@@ -139,7 +472,8 @@ def upsert_cursor(
     date: Optional[str] = None,
     status: str = "running",
     error: Optional[str] = None,
-) -> None:
+    commit: bool = True,
+) -> Dict[str, Any]:
     """
     Update or insert cursor for a source.
 
@@ -153,23 +487,23 @@ def upsert_cursor(
         date: Date of last ingested message
         status: Status (running/success/failed)
         error: Error message if failed
+        commit: Commit immediately; pass False to leave the write in a
+            transaction the caller opened with BEGIN IMMEDIATE
+
+    Returns:
+        Dict with the stored cursor fields (same shape as get_cursor)
     """
-    now = datetime.utcnow().isoformat()
+    now = _utc_now()
 
-    conn.execute("""
-        INSERT INTO ingestion_cursors
-            (source_id, tg_chat_id, last_message_id, last_message_date, last_run_at, last_status, last_error)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT (source_id) DO UPDATE SET
-            tg_chat_id = excluded.tg_chat_id,
-            last_message_id = excluded.last_message_id,
-            last_message_date = excluded.last_message_date,
-            last_run_at = excluded.last_run_at,
-            last_status = excluded.last_status,
-            last_error = excluded.last_error
-    """, (source_id, tg_chat_id, message_id, date, now, status, error))
+    # RETURNING hands back the stored row, so no follow-up get_cursor
+    row = conn.execute(
+        _SQL_UPSERT_CURSOR,
+        (source_id, tg_chat_id, message_id, date, now, status, error),
+    ).fetchone()
 
-    conn.commit()
+    if commit:
+        conn.commit()
+    return _cursor_row_to_dict(row)
 
 
 def insert_message_if_new(
@@ -178,12 +512,14 @@ def insert_message_if_new(
     msg_dict: Dict[str, Any],
     sanitized_text: str,
     raw_json: str,
+    commit: bool = True,
 ) -> bool:
     """
     Insert message if not already stored (idempotency guarantee).
 
     The UNIQUE(source_id, tg_message_id) constraint prevents duplicates.
-    If the message already exists, this function does nothing.
+    If the message already exists, this function does nothing. For more
+    than a handful of messages use insert_messages_batch instead.
 
     Args:
         conn: Database connection
@@ -191,33 +527,77 @@ def insert_message_if_new(
         msg_dict: Message data from Telethon
         sanitized_text: Sanitized message text
         raw_json: Raw message JSON
+        commit: Commit immediately; pass False to leave the write in a
+            transaction the caller opened with BEGIN IMMEDIATE
 
     Returns:
         bool: True if inserted, False if already existed
     """
-    now = datetime.utcnow().isoformat()
+    now = _utc_now()
+
+    # OR IGNORE skips an existing message without raising, so rowcount
+    # tells whether this call inserted it
+    cursor = conn.execute(_SQL_INSERT_MESSAGE, (
+        source_id,
+        msg_dict.get("tg_chat_id"),
+        msg_dict.get("tg_message_id"),
+        msg_dict.get("date"),
+        msg_dict.get("sender_id"),
+        sanitized_text,
+        msg_dict.get("permalink"),
+        raw_json,
+        now,
+    ))
+    if commit:
+        conn.commit()
+    return cursor.rowcount > 0
+
+
+def insert_messages_batch(
+    conn: sqlite3.Connection,
+    rows: List[MessageRow],
+) -> int:
+    """
+    Insert a batch of messages in a single transaction.
+
+    Rows that already exist (UNIQUE(source_id, tg_message_id)) are ignored,
+    so this is idempotent like insert_message_if_new. raw_json is built by
+    SQLite's json_object() from the message fields and the raw text.
+    If conn already has a transaction open, the batch joins it and the
+    caller commits or rolls back.
+
+    Args:
+        conn: Database connection
+        rows: MessageRow tuples (text is the sanitized text)
+
+    Returns:
+        int: Number of rows actually inserted
+    """
+    if not rows:
+        return 0
+
+    now = (_utc_now(),)
+
+    # Inside a caller's transaction the caller commits or rolls back
+    owns_transaction = not conn.in_transaction
 
     try:
-        conn.execute("""
-            INSERT INTO telegram_messages
-                (source_id, tg_chat_id, tg_message_id, date, sender_id, text, permalink, raw_json, ingested_at, processed_status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
-        """, (
-            source_id,
-            msg_dict.get("tg_chat_id"),
-            msg_dict.get("tg_message_id"),
-            msg_dict.get("date"),
-            msg_dict.get("sender_id"),
-            sanitized_text,
-            msg_dict.get("permalink"),
-            raw_json,
-            now,
-        ))
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        # UNIQUE constraint violated - message already exists
-        return False
+        # Take the write lock up front so the batch can't fail halfway on
+        # a lock upgrade while a reader holds the database
+        if owns_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.executemany(
+            _SQL_INSERT_MESSAGES_BATCH, (row + now for row in rows)
+        )
+        inserted = cursor.rowcount
+        if owns_transaction:
+            conn.commit()
+    except Exception:
+        if owns_transaction:
+            conn.rollback()
+        raise
+
+    return inserted
 
 
 def get_high_water_marks(conn: sqlite3.Connection) -> Dict[str, int]:
@@ -227,36 +607,53 @@ def get_high_water_marks(conn: sqlite3.Connection) -> Dict[str, int]:
     Returns:
         Dict mapping source_id to last_message_id
     """
-    cursor = conn.execute(
-        "SELECT source_id, last_message_id FROM ingestion_cursors"
-    )
-    return {row[0]: row[1] for row in cursor.fetchall()}
+    # Two-column rows are already (key, value) pairs; dict() drains the cursor
+    # without building an intermediate list
+    return dict(conn.execute(_SQL_GET_HIGH_WATER_MARKS))
 
 
-def get_message_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
+def get_combined_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
     """
-    Get statistics about stored messages.
+    Get message and classification statistics in one query.
+
+    The aggregates are answered by a single scan of the idx_msgs_stats
+    covering index; sources_count comes from idx_msgs_source_date.
 
     Returns:
-        Dict with total_messages, sources_count, pending_count, etc.
+        Dict with total_messages, sources_count, pending_count,
+        classified_count, ai_relevant_count, not_relevant_count and avg_score
     """
-    cursor = conn.execute("""
-        SELECT
-            COUNT(*) as total_messages,
-            COUNT(DISTINCT source_id) as sources_count,
-            SUM(CASE WHEN processed_status = 'pending' THEN 1 ELSE 0 END) as pending_count,
-            SUM(CASE WHEN processed_status = 'classified' THEN 1 ELSE 0 END) as classified_count,
-            SUM(CASE WHEN is_ai_relevant = 1 THEN 1 ELSE 0 END) as ai_relevant_count
-        FROM telegram_messages
-    """)
+    cursor = conn.execute(_SQL_COMBINED_STATS)
     row = cursor.fetchone()
 
     return {
         "total_messages": row[0] or 0,
-        "sources_count": row[1] or 0,
-        "pending_count": row[2] or 0,
-        "classified_count": row[3] or 0,
-        "ai_relevant_count": row[4] or 0,
+        "sources_count": row[6] or 0,
+        "pending_count": row[1] or 0,
+        "classified_count": row[2] or 0,
+        "ai_relevant_count": row[3] or 0,
+        "not_relevant_count": row[4] or 0,
+        "avg_score": round(row[5], 2) if row[5] else 0.0,
+    }
+
+
+def get_message_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Get statistics about stored messages.
+
+    Returns:
+        Dict with total_messages, sources_count, pending_count, etc.
+    """
+    stats = get_combined_stats(conn)
+    return {
+        key: stats[key]
+        for key in (
+            "total_messages",
+            "sources_count",
+            "pending_count",
+            "classified_count",
+            "ai_relevant_count",
+        )
     }
 
 
@@ -265,9 +662,37 @@ def fetch_pending_messages(
     limit: Optional[int] = None,
     only_source_id: Optional[str] = None,
     reprocess: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream messages that need classification, one dict at a time.
+
+    Rows are pulled from SQLite in chunks of 1000, so memory stays flat
+    however long the queue is. Use fetch_pending_messages_list when a list
+    is needed.
+
+    Args:
+        conn: Database connection
+        limit: Maximum number of messages to fetch
+        only_source_id: Filter to specific source
+        reprocess: If True, fetch all messages; if False, only pending
+
+    Yields:
+        Message dictionaries
+    """
+    for batch in iter_pending_batches(
+        conn, limit, only_source_id, reprocess, batch_size=1000
+    ):
+        yield from batch
+
+
+def fetch_pending_messages_list(
+    conn: sqlite3.Connection,
+    limit: Optional[int] = None,
+    only_source_id: Optional[str] = None,
+    reprocess: bool = False,
 ) -> List[Dict[str, Any]]:
     """
-    Fetch messages that need classification.
+    Fetch messages that need classification as a list.
 
     Args:
         conn: Database connection
@@ -278,43 +703,69 @@ def fetch_pending_messages(
     Returns:
         List of message dictionaries
     """
-    query = """
-        SELECT
-            id, source_id, tg_chat_id, tg_message_id, date, text, permalink
-        FROM telegram_messages
-        WHERE 1=1
-    """
+    query, params = _pending_messages_query(limit, only_source_id, reprocess)
 
-    params = []
+    return [_pending_row_to_dict(row) for row in conn.execute(query, params)]
 
-    if not reprocess:
-        query += " AND processed_status = 'pending'"
 
-    if only_source_id:
-        query += " AND source_id = ?"
-        params.append(only_source_id)
+def iter_pending_batches(
+    conn: sqlite3.Connection,
+    limit: Optional[int] = None,
+    only_source_id: Optional[str] = None,
+    reprocess: bool = False,
+    batch_size: int = 128,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Stream messages that need classification in batches.
 
-    query += " ORDER BY date DESC"
+    Rows are read with cursor.fetchmany() so only one batch is held in
+    memory at a time.
 
-    if limit:
-        query += " LIMIT ?"
-        params.append(limit)
+    Args:
+        conn: Database connection
+        limit: Maximum number of messages to fetch
+        only_source_id: Filter to specific source
+        reprocess: If True, fetch all messages; if False, only pending
+        batch_size: Number of messages per yielded batch
+
+    Yields:
+        Lists of message dictionaries (at most batch_size each)
+    """
+    query, params = _pending_messages_query(limit, only_source_id, reprocess)
 
     cursor = conn.execute(query, params)
-    rows = cursor.fetchall()
+    cursor.arraysize = batch_size
+
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            break
+        yield [_pending_row_to_dict(row) for row in rows]
+
+
+def _pending_messages_query(
+    limit: Optional[int],
+    only_source_id: Optional[str],
+    reprocess: bool,
+) -> Tuple[str, List[Any]]:
+    """Pick the SELECT shared by the pending-message fetchers, with its params."""
+    # LIMIT -1 means no limit in SQLite
+    if only_source_id:
+        return _SQL_PENDING[reprocess, True], [only_source_id, limit or -1]
+    return _SQL_PENDING[reprocess, False], [limit or -1]
 
-    return [
-        {
-            "id": row[0],
-            "source_id": row[1],
-            "tg_chat_id": row[2],
-            "tg_message_id": row[3],
-            "date": row[4],
-            "text": row[5],
-            "permalink": row[6],
-        }
-        for row in rows
-    ]
+
+def _pending_row_to_dict(row: Tuple) -> Dict[str, Any]:
+    """Convert a pending-message row to a dictionary."""
+    return {
+        "id": row[0],
+        "source_id": row[1],
+        "tg_chat_id": row[2],
+        "tg_message_id": row[3],
+        "date": row[4],
+        "text": row[5],
+        "permalink": row[6],
+    }
 
 
 def upsert_message_classification(
@@ -327,6 +778,7 @@ def upsert_message_classification(
     score: float,
     reasons: List[str],
     classification_metadata: Dict[str, Any],
+    commit: bool = True,
 ) -> None:
     """
     Insert or update classification record in message_classifications table.
@@ -341,28 +793,20 @@ def upsert_message_classification(
         score: Relevance score
         reasons: List of reason strings
         classification_metadata: Dict with matched keywords, weights, etc.
+        commit: Commit immediately; pass False to leave the write in a
+            transaction the caller opened with BEGIN IMMEDIATE
     """
-    now = datetime.utcnow().isoformat()
-    reasons_json = json.dumps(reasons, ensure_ascii=False)
-    metadata_json = json.dumps(classification_metadata, ensure_ascii=False)
+    now = _utc_now()
+    reasons_json = _json_dumps(reasons)
+    metadata_json = _json_dumps(classification_metadata)
 
-    conn.execute("""
-        INSERT INTO message_classifications
-            (source_id, tg_message_id, tg_chat_id, classifier_version,
-             is_ai_relevant, score, reasons_json, classification_metadata, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT (source_id, tg_message_id, classifier_version) DO UPDATE SET
-            is_ai_relevant = excluded.is_ai_relevant,
-            score = excluded.score,
-            reasons_json = excluded.reasons_json,
-            classification_metadata = excluded.classification_metadata,
-            created_at = excluded.created_at
-    """, (
+    conn.execute(_SQL_UPSERT_CLASSIFICATION, (
         source_id, tg_message_id, tg_chat_id, classifier_version,
         is_ai_relevant, score, reasons_json, metadata_json, now
     ))
 
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def mark_message_classified(
@@ -371,6 +815,7 @@ def mark_message_classified(
     tg_message_id: int,
     is_ai_relevant: int,
     score: float,
+    commit: bool = True,
 ) -> None:
     """
     Update telegram_messages to mark as classified.
@@ -381,18 +826,264 @@ def mark_message_classified(
         tg_message_id: Message ID from Telegram
         is_ai_relevant: 0 or 1
         score: Relevance score
+        commit: Commit immediately; pass False to leave the write in a
+            transaction the caller opened with BEGIN IMMEDIATE
     """
-    now = datetime.utcnow().isoformat()
+    now = _utc_now()
 
-    conn.execute("""
-        UPDATE telegram_messages
-        SET processed_status = 'classified',
-            is_ai_relevant = ?,
-            ai_relevance_score = ?,
-            classified_at = ?
-        WHERE source_id = ? AND tg_message_id = ?
-    """, (is_ai_relevant, score, now, source_id, tg_message_id))
+    conn.execute(
+        _SQL_MARK_CLASSIFIED,
+        (is_ai_relevant, score, now, source_id, tg_message_id),
+    )
+
+    if commit:
+        conn.commit()
+
+
+def save_classifications_batch(
+    conn: sqlite3.Connection,
+    classifier_version: str,
+    rows: List[Tuple[str, int, int, int, float, List[str], Dict[str, Any]]],
+    audit_log: Optional[str] = None,
+) -> None:
+    """
+    Store a batch of classifications in a single transaction.
+
+    Marks the telegram_messages rows as classified using executemany and
+    records the audit trail: as message_classifications rows by default, or
+    appended to a JSON Lines file when audit_log is given (one table write
+    per message instead of two; rebuild_audit_table_from_log restores the
+    table from that file). The log is written before the commit; if the
+    write fails the batch is rolled back. A commit that fails after the log
+    write leaves records for still-pending messages, which the next run
+    overwrites when it classifies them again. If conn already has a
+    transaction open, the batch joins it and the caller commits or rolls
+    back.
+
+    Args:
+        conn: Database connection
+        classifier_version: Version identifier for classifier
+        rows: (source_id, tg_message_id, tg_chat_id, is_ai_relevant,
+               score, reasons, classification_metadata) tuples
+        audit_log: Optional path of a JSONL file to append audit records to
+            instead of writing message_classifications
+    """
+    if not rows:
+        return
 
+    now = _utc_now()
+
+    owns_transaction = not conn.in_transaction
+
+    try:
+        if owns_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        if audit_log is None:
+            conn.executemany(_SQL_UPSERT_CLASSIFICATION, [
+                (
+                    source_id, tg_message_id, tg_chat_id, classifier_version,
+                    is_ai_relevant, score,
+                    _json_dumps(reasons),
+                    _json_dumps(metadata),
+                    now,
+                )
+                for source_id, tg_message_id, tg_chat_id, is_ai_relevant, score, reasons, metadata in rows
+            ])
+
+        conn.executemany(_SQL_MARK_CLASSIFIED, [
+            (is_ai_relevant, score, now, source_id, tg_message_id)
+            for source_id, tg_message_id, _, is_ai_relevant, score, _, _ in rows
+        ])
+
+        if audit_log is not None:
+            # Logged before commit, so a failed write rolls the batch back
+            # and its messages stay pending instead of losing their audit
+            # records. The whole batch goes out in one write on an O_APPEND
+            # handle, so concurrent runs never interleave partial lines.
+            records = b"".join(
+                _json_line({
+                    "source_id": source_id,
+                    "tg_message_id": tg_message_id,
+                    "tg_chat_id": tg_chat_id,
+                    "classifier_version": classifier_version,
+                    "is_ai_relevant": is_ai_relevant,
+                    "score": score,
+                    "reasons": reasons,
+                    "classification_metadata": metadata,
+                    "created_at": now,
+                })
+                for source_id, tg_message_id, tg_chat_id, is_ai_relevant, score, reasons, metadata in rows
+            )
+            with open(audit_log, "ab") as f:
+                f.write(records)
+
+        if owns_transaction:
+            conn.commit()
+    except Exception:
+        if owns_transaction:
+            conn.rollback()
+        raise
+
+
+def rebuild_audit_table_from_log(conn: sqlite3.Connection, log_path: str) -> int:
+    """
+    Load a classification audit log into message_classifications.
+
+    Records are upserted on (source_id, tg_message_id, classifier_version),
+    so replaying a log (or overlapping logs) is idempotent; later lines win.
+    If conn already has a transaction open, the load joins it and the caller
+    commits or rolls back.
+
+    Args:
+        conn: Database connection
+        log_path: JSONL file written by save_classifications_batch(audit_log=...)
+
+    Returns:
+        int: Number of records read from the log
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    count = 0
+
+    owns_transaction = not conn.in_transaction
+
+    try:
+        if owns_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        with open(log_path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = loads(line)
+                conn.execute(_SQL_UPSERT_CLASSIFICATION, (
+                    record["source_id"],
+                    record["tg_message_id"],
+                    record["tg_chat_id"],
+                    record["classifier_version"],
+                    record["is_ai_relevant"],
+                    record["score"],
+                    _json_dumps(record["reasons"]),
+                    _json_dumps(record["classification_metadata"]),
+                    record["created_at"],
+                ))
+                count += 1
+        if owns_transaction:
+            conn.commit()
+    except Exception:
+        if owns_transaction:
+            conn.rollback()
+        raise
+
+    return count
+
+
+class WriteTransaction:
+    """
+    Write helpers bound to a transaction opened by writer_transaction.
+
+    Each method runs the matching module-level function without committing;
+    the enclosing writer_transaction commits them all at once.
+    """
+
+    __slots__ = ("conn",)
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def insert_message(
+        self,
+        source_id: str,
+        msg_dict: Dict[str, Any],
+        sanitized_text: str,
+        raw_json: str,
+    ) -> bool:
+        """insert_message_if_new inside the transaction."""
+        return insert_message_if_new(
+            self.conn, source_id, msg_dict, sanitized_text, raw_json, commit=False
+        )
+
+    def upsert_cursor(
+        self,
+        source_id: str,
+        tg_chat_id: int,
+        message_id: int,
+        date: Optional[str] = None,
+        status: str = "running",
+        error: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """upsert_cursor inside the transaction."""
+        return upsert_cursor(
+            self.conn, source_id, tg_chat_id, message_id, date, status, error,
+            commit=False,
+        )
+
+    def mark_classified(
+        self,
+        source_id: str,
+        tg_message_id: int,
+        is_ai_relevant: int,
+        score: float,
+    ) -> None:
+        """mark_message_classified inside the transaction."""
+        mark_message_classified(
+            self.conn, source_id, tg_message_id, is_ai_relevant, score, commit=False
+        )
+
+    def upsert_classification(
+        self,
+        source_id: str,
+        tg_message_id: int,
+        tg_chat_id: int,
+        classifier_version: str,
+        is_ai_relevant: int,
+        score: float,
+        reasons: List[str],
+        classification_metadata: Dict[str, Any],
+    ) -> None:
+        """upsert_message_classification inside the transaction."""
+        upsert_message_classification(
+            self.conn, source_id, tg_message_id, tg_chat_id, classifier_version,
+            is_ai_relevant, score, reasons, classification_metadata, commit=False,
+        )
+
+    def insert_messages(self, rows: List[MessageRow]) -> int:
+        """insert_messages_batch inside the transaction."""
+        return insert_messages_batch(self.conn, rows)
+
+    def save_classifications(
+        self,
+        classifier_version: str,
+        rows: List[Tuple[str, int, int, int, float, List[str], Dict[str, Any]]],
+        audit_log: Optional[str] = None,
+    ) -> None:
+        """save_classifications_batch inside the transaction."""
+        save_classifications_batch(self.conn, classifier_version, rows, audit_log)
+
+
+@contextmanager
+def writer_transaction(conn: sqlite3.Connection) -> Iterator[WriteTransaction]:
+    """
+    Group heterogeneous writes into one BEGIN IMMEDIATE transaction.
+
+    Usage:
+        with writer_transaction(conn) as tx:
+            tx.insert_message(source_id, msg_dict, text, raw_json)
+            tx.upsert_cursor(source_id, chat_id, message_id, status="success")
+
+    Commits once when the block exits normally and rolls back if it raises.
+    Must not be entered while conn already has a transaction open.
+
+    Args:
+        conn: Database connection from init_db
+
+    Yields:
+        WriteTransaction bound to conn
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield WriteTransaction(conn)
+    except BaseException:
+        conn.rollback()
+        raise
     conn.commit()
 
 
@@ -403,26 +1094,9 @@ def get_classification_statistics(conn: sqlite3.Connection) -> Dict[str, Any]:
     Returns:
         Dict with total, pending, classified, ai_relevant counts
     """
-    cursor = conn.execute("""
-        SELECT
-            COUNT(*) as total_messages,
-            SUM(CASE WHEN processed_status = 'pending' THEN 1 ELSE 0 END) as pending_count,
-            SUM(CASE WHEN processed_status = 'classified' THEN 1 ELSE 0 END) as classified_count,
-            SUM(CASE WHEN is_ai_relevant = 1 THEN 1 ELSE 0 END) as ai_relevant_count,
-            SUM(CASE WHEN is_ai_relevant = 0 THEN 1 ELSE 0 END) as not_relevant_count,
-            AVG(CASE WHEN ai_relevance_score IS NOT NULL THEN ai_relevance_score ELSE NULL END) as avg_score
-        FROM telegram_messages
-    """)
-    row = cursor.fetchone()
-
-    return {
-        "total_messages": row[0] or 0,
-        "pending_count": row[1] or 0,
-        "classified_count": row[2] or 0,
-        "ai_relevant_count": row[3] or 0,
-        "not_relevant_count": row[4] or 0,
-        "avg_score": round(row[5], 2) if row[5] else 0.0,
-    }
+    stats = get_combined_stats(conn)
+    del stats["sources_count"]
+    return stats
 
 
 def fetch_ai_relevant_messages(
@@ -445,7 +1119,7 @@ def fetch_ai_relevant_messages(
             ai_relevance_score, permalink, classified_at
         FROM telegram_messages
         WHERE is_ai_relevant = 1
-        ORDER BY ai_relevance_score DESC, date DESC
+        ORDER BY ai_relevance_score DESC, date_unix DESC
     """
 
     params = []